@@ -1,4 +1,8 @@
+import copy
+import threading
+from collections import OrderedDict
 from datetime import timedelta
+from typing import Optional
 
 from flask import jsonify, request
 from flask_jwt_extended import (
@@ -10,6 +14,53 @@ from flask_jwt_extended import (
 from db import db
 from models import User, UserORM
 
+# Bounded LRU of recently-seen users, keyed by username. Every protected
+# route resolves the JWT identity through ``get_user``; this turns the
+# per-request ``UserORM`` query + dataclass conversion into a dict hit.
+# Writers (register, ``persist_user``) refresh the entry only after their
+# commit succeeds, so the cache never lags the DB for changes made through
+# this module. Entries are private: readers get a copy (see ``_detached``),
+# so a route mutating its user can't leak that change to other requests.
+_USER_CACHE_SIZE = 1024
+_recent_users: "OrderedDict[str, User]" = OrderedDict()
+_users_lock = threading.Lock()
+
+
+def _detached(user: User) -> User:
+    """A copy of ``user`` that shares no mutable state with the original."""
+    clone = copy.copy(user)
+    clone.shared_experiments = dict(user.shared_experiments)
+    return clone
+
+
+def _cache_get(username: str) -> Optional[User]:
+    with _users_lock:
+        user = _recent_users.get(username)
+        if user is None:
+            return None
+        _recent_users.move_to_end(username)
+    return _detached(user)
+
+
+def _cache_put(user: User) -> None:
+    user = _detached(user)
+    with _users_lock:
+        _recent_users[user.username] = user
+        _recent_users.move_to_end(user.username)
+        if len(_recent_users) > _USER_CACHE_SIZE:
+            _recent_users.popitem(last=False)
+
+
+def _cache_drop(username: str) -> None:
+    with _users_lock:
+        _recent_users.pop(username, None)
+
+
+def clear_user_cache() -> None:
+    """Drop every cached user. Test helper (call after resetting the DB)."""
+    with _users_lock:
+        _recent_users.clear()
+
 
 def register_auth_routes(app, jwt):
     """Register /api/auth/* routes and return a get_user(username) helper."""
@@ -32,6 +83,7 @@ def register_auth_routes(app, jwt):
         user = User(username=username, email=email, password=password)
         db.session.add(UserORM.from_dataclass(user))
         db.session.commit()
+        _cache_put(user)
 
         token = create_access_token(identity=username, expires_delta=timedelta(days=7))
         return jsonify({"token": token, "user": _user_payload(user)}), 201
@@ -76,9 +128,17 @@ def register_auth_routes(app, jwt):
         a dataclass-shaped object with ``shared_experiments``, ``check_password``,
         etc. Callers that need to MUTATE shared_experiments must go through
         ``persist_user`` (or query UserORM directly) so changes hit the DB.
+        The returned object is the caller's own copy.
         """
+        user = _cache_get(username)
+        if user is not None:
+            return user
         orm = UserORM.query.filter_by(username=username).first()
-        return orm.to_dataclass() if orm else None
+        if orm is None:
+            return None
+        user = orm.to_dataclass()
+        _cache_put(user)
+        return user
 
     return get_user
 
@@ -87,12 +147,21 @@ def persist_user(user: User) -> None:
     """Write a dataclass User's mutable fields back to the DB.
 
     Used by share/permission flows in main.py that mutate ``user.shared_experiments``.
+    The cache is refreshed only once the commit succeeds; on failure the
+    session is rolled back, the entry dropped (the next read reloads from
+    the DB) and the error re-raised.
     """
     orm = UserORM.query.filter_by(username=user.username).first()
     if orm is None:
         return
     orm.apply_dataclass(user)
-    db.session.commit()
+    try:
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        _cache_drop(user.username)
+        raise
+    _cache_put(user)
 
 
 def _user_payload(user):
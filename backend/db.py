@@ -57,6 +57,11 @@ def init_db(app, database_uri: Optional[str] = None) -> None:
 
     with app.app_context():
         db.create_all()
+        # create_all skips tables that already exist, including any index
+        # added to them since; create those individually.
+        for table in db.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(db.engine, checkfirst=True)
 
 
 def reset_db(app) -> None:
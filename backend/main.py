@@ -1,11 +1,28 @@
+import os
+
+# Socket.IO async mode, e.g. ``SOCKETIO_ASYNC_MODE=eventlet`` for a single
+# reactor serving many concurrent clients. Unset keeps Flask-SocketIO's
+# auto-detection. eventlet must monkey-patch before anything else imports
+# socket/threading, hence this block sits above every other import.
+_SOCKETIO_ASYNC_MODE = os.environ.get("SOCKETIO_ASYNC_MODE") or None
+if _SOCKETIO_ASYNC_MODE == "eventlet":
+    import eventlet
+
+    eventlet.monkey_patch()
+
 from datetime import datetime, timedelta
+import gzip
+import hashlib
+import heapq
 import json
 import logging
-import os
-import tempfile
+from operator import attrgetter
+import sys
 import uuid
+import zlib
+from typing import Optional
 
-from flask import Flask, jsonify, request, send_file
+from flask import Flask, Response, jsonify, request, stream_with_context
 from flask_cors import CORS
 from flask_socketio import SocketIO, join_room
 from flask_jwt_extended import (
@@ -31,6 +48,8 @@ from models import (
     StepORM,
     TemplateORM,
     UserORM,
+    _STEP_TYPE_MAP,
+    new_id,
 )
 from scheduler import Scheduler
 import auth
@@ -39,7 +58,17 @@ from permissions import (
     can_edit_experiment,
     can_run_step,
 )
-from serializers import experiment_to_dict, step_to_dict, template_steps_payload
+from serializers import (
+    OrjsonProvider,
+    OrjsonSocketJSON,
+    dumps_bytes,
+    experiment_to_dict,
+    experiment_to_json,
+    experiment_version,
+    orjson,
+    step_to_dict,
+    template_steps_payload,
+)
 
 # Import notification system
 from notifications import NotificationService, Notification, NotificationType, NotificationPriority, ActionType, NotificationAction, create_notification_factories
@@ -47,10 +76,89 @@ from notifications import NotificationService, Notification, NotificationType, N
 logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
+if orjson is not None:
+    # Experiment payloads are dict-of-list-of-dict; orjson encodes them
+    # several times faster than the stdlib encoder behind jsonify.
+    app.json = OrjsonProvider(app)
 CORS(app)
 
+# Gzip JSON bodies for clients that send ``Accept-Encoding: gzip``. Step
+# payloads (ISO timestamps, notes) compress very well; bodies under the
+# minimum size aren't worth the CPU. Buffered responses are compressed in
+# ``_gzip_json_response``; streamed ones chunk by chunk in
+# ``_json_array_response``.
+_GZIP_MIN_SIZE = 500
+_GZIP_LEVEL = 6
+
+
+def _accepts_gzip() -> bool:
+    return 'gzip' in request.accept_encodings
+
+
+@app.after_request
+def _gzip_json_response(response):
+    if (
+        response.mimetype != 'application/json'
+        or response.is_streamed
+        or response.direct_passthrough
+        or 'Content-Encoding' in response.headers
+    ):
+        return response
+    response.vary.add('Accept-Encoding')
+    if not _accepts_gzip():
+        return response
+    body = response.get_data()
+    if len(body) < _GZIP_MIN_SIZE:
+        return response
+    response.set_data(gzip.compress(body, compresslevel=_GZIP_LEVEL))
+    response.headers['Content-Encoding'] = 'gzip'
+    return response
+
+# Conditional GETs on experiment reads. ``version`` restarts at 0 with the
+# process, so every ETag carries a per-process token; otherwise a client
+# holding a tag from before a restart could match a different state.
+_ETAG_PROCESS_TOKEN = uuid.uuid4().hex[:8]
+
+
+def _experiments_etag(experiments, variant: str) -> str:
+    """Weak-ETag value covering the current version of each experiment.
+
+    A single experiment gets a readable ``<id>-<version>`` tag; a list gets
+    a digest of its ``(id, version)`` pairs, so adding, removing or
+    reordering entries changes it too. ``variant`` names the representation
+    (``iso``, ``epoch``, ``export``) so the same data rendered differently
+    never shares a tag.
+    """
+    if len(experiments) == 1:
+        exp = experiments[0]
+        return f'{exp.id}-{experiment_version(exp)}-{variant}-{_ETAG_PROCESS_TOKEN}'
+    digest = hashlib.blake2b(digest_size=12)
+    for exp in experiments:
+        digest.update(f'{exp.id}:{experiment_version(exp)};'.encode())
+    return f'{digest.hexdigest()}-{variant}-{_ETAG_PROCESS_TOKEN}'
+
+
+def _not_modified(etag: str) -> Optional[Response]:
+    """A 304 response if the client's ``If-None-Match`` already has ``etag``."""
+    if not request.if_none_match.contains_weak(etag):
+        return None
+    response = Response(status=304)
+    _set_etag(response, etag)
+    return response
+
+
+def _set_etag(response: Response, etag: str) -> Response:
+    response.set_etag(etag, weak=True)
+    # Per-user data: browsers may keep it but must revalidate every time.
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
 # Initialize SocketIO
-socketio = SocketIO(app, cors_allowed_origins="*")
+# experiment_update / notification emits encode with orjson too when present.
+_socketio_options = {'json': OrjsonSocketJSON} if orjson is not None else {}
+socketio = SocketIO(
+    app, cors_allowed_origins="*", async_mode=_SOCKETIO_ASYNC_MODE, **_socketio_options
+)
 
 # Global scheduler instance to maintain state
 scheduler = Scheduler()
@@ -87,25 +195,98 @@ notification_service = NotificationService(socketio)
 notification_factories = create_notification_factories(scheduler)
 
 # --- Define Helper Function to Print Schedule --- 
-def print_schedule(scheduler: Scheduler):
-    print("\n--- Current Schedule ---")
-    # Sort steps by scheduled start time for readability
-    sorted_steps = sorted(
-        scheduler.schedule.values(),
-        key=lambda s: s.scheduled_start_time or datetime.max
-    )
+_by_sort_key = attrgetter('_sort_key')
+
+# Row template bound once at import; per step we only build the field dict.
+_SCHEDULE_ROW = (
+    "- {name:<20} | Status: {status:<10} | Type: {type:<15} "
+    "| Scheduled: {start} - {end} | Actual: {actual_start} - {actual_end}\n"
+).format_map
+
+
+def print_schedule(scheduler: Scheduler, limit: Optional[int] = None):
+    """Print the schedule ordered by scheduled start (unscheduled steps last).
+
+    ``limit`` prints only the ``limit`` earliest steps, selected with
+    ``heapq.nsmallest`` rather than sorting the whole schedule. Rows are
+    joined and written in one call so stdout isn't flushed per step.
+    """
+    steps = scheduler.schedule.values()
+    if limit is None:
+        sorted_steps = sorted(steps, key=_by_sort_key)
+    else:
+        sorted_steps = heapq.nsmallest(limit, steps, key=_by_sort_key)
+
+    rows = ["\n--- Current Schedule ---\n"]
     for step in sorted_steps:
-        start = step.scheduled_start_time.strftime("%H:%M:%S") if step.scheduled_start_time else "Not Scheduled"
-        end = step.scheduled_end_time.strftime("%H:%M:%S") if step.scheduled_end_time else "Not Scheduled"
-        actual_start = step.actual_start_time.strftime("%H:%M:%S") if step.actual_start_time else "N/A"
-        actual_end = step.actual_end_time.strftime("%H:%M:%S") if step.actual_end_time else "N/A"
-        print(
-            f"- {step.name:<20} | Status: {step.status.value:<10} | Type: {step.step_type.value:<15} | Scheduled: {start} - {end} | Actual: {actual_start} - {actual_end}"
-        )
-    print("------------------------\n")
+        # Clock strings are cached on the step once rendered.
+        rows.append(_SCHEDULE_ROW({
+            "name": step.name,
+            "status": step._status_value,
+            "type": step._type_value,
+            "start": step.clock_str("scheduled_start") or "Not Scheduled",
+            "end": step.clock_str("scheduled_end") or "Not Scheduled",
+            "actual_start": step.clock_str("actual_start") or "N/A",
+            "actual_end": step.clock_str("actual_end") or "N/A",
+        }))
+    rows.append("------------------------\n\n")
+    sys.stdout.write("".join(rows))
 
 # --- API Routes ---
 
+def _wants_epoch_times() -> bool:
+    """True when a read route was called with ``?format=epoch``.
+
+    Epoch mode emits step times as float Unix seconds instead of ISO
+    strings; see ``serializers`` for the trade-off.
+    """
+    return request.args.get('format') == 'epoch'
+
+
+def _gzip_chunks(chunks):
+    """Gzip an iterable of ``bytes`` chunks as one stream."""
+    # wbits=31: deflate with a gzip header/trailer.
+    compressor = zlib.compressobj(_GZIP_LEVEL, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        out = compressor.compress(chunk)
+        if out:
+            yield out
+    yield compressor.flush()
+
+
+def _json_array_response(items, encoded=False):
+    """Stream ``items`` (an iterable of JSON-able objects) as a JSON array.
+
+    Each element is encoded and yielded on its own, so peak memory is one
+    element's encoding rather than the whole list's. Lazy per-element work
+    (e.g. serialization inside a generator expression) runs while the
+    response streams, inside the request context. With ``encoded=True`` the
+    items are already JSON ``bytes`` (e.g. from ``experiment_to_json``) and
+    are written as-is. Gzip-capable clients get the stream compressed
+    incrementally.
+    """
+    dumps = None if encoded else app.json.dumps
+
+    def generate():
+        yield b'['
+        separator = b''
+        for item in items:
+            yield separator
+            yield item if dumps is None else dumps(item).encode()
+            separator = b','
+        yield b']'
+
+    if _accepts_gzip():
+        response = Response(
+            stream_with_context(_gzip_chunks(generate())), mimetype='application/json'
+        )
+        response.headers['Content-Encoding'] = 'gzip'
+        response.vary.add('Accept-Encoding')
+        return response
+
+    return Response(stream_with_context(generate()), mimetype='application/json')
+
+
 @app.route('/api/experiments', methods=['GET'])
 @jwt_required()
 def get_experiments():
@@ -118,12 +299,20 @@ def get_experiments():
     """
     username = get_jwt_identity()
     user = get_user(username) if username else None
-    experiments = [
-        experiment_to_dict(exp)
-        for exp in scheduler.experiments.values()
+    epoch = _wants_epoch_times()
+    # Snapshot the references up front so a concurrent create/delete can't
+    # resize the dict mid-stream; the dicts themselves are built lazily.
+    visible = [
+        exp for exp in list(scheduler.experiments.values())
         if can_view_experiment(user, exp)
     ]
-    return jsonify(experiments)
+    etag = _experiments_etag(visible, 'epoch' if epoch else 'iso')
+    not_modified = _not_modified(etag)
+    if not_modified is not None:
+        return not_modified
+    return _set_etag(_json_array_response(
+        (experiment_to_json(exp, epoch) for exp in visible), encoded=True
+    ), etag)
 
 @app.route('/api/experiments/<experiment_id>', methods=['GET'])
 @jwt_required()
@@ -141,7 +330,14 @@ def get_experiment(experiment_id):
     if not experiment or not can_view_experiment(user, experiment):
         return jsonify({'error': 'Experiment not found'}), 404
 
-    return jsonify(experiment_to_dict(experiment))
+    epoch = _wants_epoch_times()
+    etag = _experiments_etag([experiment], 'epoch' if epoch else 'iso')
+    not_modified = _not_modified(etag)
+    if not_modified is not None:
+        return not_modified
+    return _set_etag(Response(
+        experiment_to_json(experiment, epoch), mimetype='application/json'
+    ), etag)
 
 def _step_from_payload(step_data: dict) -> Step:
     """Build a ``Step`` from an incoming JSON payload.
@@ -153,13 +349,14 @@ def _step_from_payload(step_data: dict) -> Step:
 
     The duration is parsed as a float so sub-second precision survives the
     round-trip (the audit's ``// 60`` truncation bug was the symptom of
-    treating duration as integer minutes).
+    treating duration as integer minutes). A missing or unrecognized
+    ``step_type`` falls back to ``fixed_duration``.
     """
     duration_seconds = float(step_data.get('duration_seconds', 0) or 0)
     return Step(
         name=step_data['name'],
         duration=timedelta(seconds=duration_seconds),
-        step_type=StepType(step_data.get('step_type', 'fixed_duration')),
+        step_type=_STEP_TYPE_MAP.get(step_data.get('step_type'), StepType.FIXED_DURATION),
         dependencies=step_data.get('dependencies', []),
         notes=step_data.get('notes'),
         resource_needed=step_data.get('resource_required'),
@@ -190,7 +387,7 @@ def create_experiment():
 
     if experiment.steps:
         start_time = datetime.now()
-        scheduler.calculate_initial_schedule(start_time=start_time)
+        scheduler.calculate_initial_schedule(start_time=start_time, only=experiment.id)
 
     return jsonify(experiment_to_dict(experiment)), 201
 
@@ -218,9 +415,13 @@ def update_experiment(experiment_id):
 
     data = request.json or {}
 
-    # Update basic info
-    experiment.name = data.get('name', experiment.name)
-    experiment.description = data.get('description', experiment.description)
+    # Update basic info; an unchanged experiment keeps its serializer cache.
+    name = data.get('name', experiment.name)
+    description = data.get('description', experiment.description)
+    if name != experiment.name or description != experiment.description:
+        experiment.name = name
+        experiment.description = description
+        experiment.mark_dirty()
 
     if 'steps' in data:
         # Build a list of incoming Step objects. If the client sends an `id`
@@ -230,15 +431,19 @@ def update_experiment(experiment_id):
         for step_data in data['steps']:
             new_step = _step_from_payload(step_data)
             if step_data.get('id'):
-                new_step.id = step_data['id']
+                new_step.id = sys.intern(step_data['id'])
             incoming.append(new_step)
 
         scheduler.upsert_experiment_steps(experiment, incoming)
 
         # Recalculate schedule for any newly-added (PENDING) steps. Existing
-        # RUNNING/COMPLETED steps are skipped by calculate_initial_schedule.
-        start_time = datetime.now()
-        scheduler.calculate_initial_schedule(start_time=start_time)
+        # RUNNING/COMPLETED steps are skipped by calculate_initial_schedule,
+        # and a PUT that changed nothing schedule-relevant is a no-op there.
+        # Same guard as the create routes: nothing to plan once every step
+        # has been removed.
+        if experiment.steps:
+            start_time = datetime.now()
+            scheduler.calculate_initial_schedule(start_time=start_time, only=experiment.id)
 
     # Persist top-level field updates (name, description) too.
     exp_orm = db.session.get(ExperimentORM, experiment.id)
@@ -253,7 +458,8 @@ def update_experiment(experiment_id):
     # owner only; share-recipients are intentionally out of scope here and
     # tracked as a deferred follow-up.
     conflicts = Scheduler.check_for_conflicts(experiment)
-    _emit_resource_conflict_notifications(experiment, conflicts)
+    with notification_service.batch():
+        _emit_resource_conflict_notifications(experiment, conflicts)
     payload = experiment_to_dict(experiment)
     payload["conflicts"] = conflicts
     return jsonify(payload)
@@ -282,10 +488,7 @@ def get_experiment_conflicts(experiment_id):
 
 def _find_experiment_for_step(step_id):
     """Locate the experiment that owns a step. Helper for step-state routes."""
-    for exp in scheduler.experiments.values():
-        if step_id in exp.steps:
-            return exp
-    return None
+    return scheduler.get_experiment_for_step(step_id)
 
 
 def _authorize_step_transition(step_id):
@@ -324,17 +527,13 @@ def _emit_experiment_update(experiment):
         logger.warning("experiment_update emit failed: %s", exc)
 
 
-def _snapshot_step_statuses(experiment):
-    """Capture {step_id: status} so we can detect newly-READY steps post-update."""
-    return {sid: s.status for sid, s in experiment.steps.items()}
-
-
-def _emit_step_ready_notifications(experiment, prev_status_map):
+def _emit_step_ready_notifications(experiment, released):
     """Emit one ``step_ready`` notification per dependent that just unblocked.
 
-    Compares the post-transition step statuses against ``prev_status_map``
-    and fans out a single notification (to ``experiment.owner``) for each
-    step that transitioned to ``READY`` since the snapshot. The
+    ``released`` is what the scheduler's transition handler returned: the
+    steps its READY sweep flipped. One notification (to ``experiment.owner``)
+    goes out per released step of this experiment, so the cost tracks the
+    number of unblocked steps rather than the experiment's size. The
     ``add_notification`` call also writes one ``NotificationORM`` row per
     target user, so a logged-out owner still finds the notification on next
     login -- the SocketIO emit is best-effort.
@@ -342,9 +541,9 @@ def _emit_step_ready_notifications(experiment, prev_status_map):
     owner = getattr(experiment, "owner", None)
     if not owner:
         return
-    for step_id, step in experiment.steps.items():
-        prev = prev_status_map.get(step_id)
-        if step.status == StepStatus.READY and prev != StepStatus.READY:
+    steps = experiment.steps
+    for step in released:
+        if step.id in steps:
             notification = notification_factories["step_ready"](
                 step, experiment, target_users=[owner]
             )
@@ -397,12 +596,25 @@ def _emit_resource_conflict_notifications(experiment, conflicts):
             logger.warning("resource_conflict notification emit failed: %s", exc)
 
 
+# Status each transition route leaves a step in. A request for a step that
+# is already there (typically a client retry) is answered with the current
+# experiment, skipping the scheduler, the broadcast and any notifications.
+_EVENT_TARGET_STATUS = {
+    'start': StepStatus.RUNNING,
+    'pause': StepStatus.PAUSED,
+    'complete': StepStatus.COMPLETED,
+    'skip': StepStatus.SKIPPED,
+}
+
+
 @app.route('/api/steps/<step_id>/start', methods=['POST'])
 @jwt_required()
 def start_step(step_id):
     step, experiment, err = _authorize_step_transition(step_id)
     if err is not None:
         return err
+    if step.status is StepStatus.RUNNING:
+        return jsonify(experiment_to_dict(experiment))
 
     scheduler.handle_step_start(step_id)
     _emit_experiment_update(experiment)
@@ -414,6 +626,8 @@ def pause_step(step_id):
     step, experiment, err = _authorize_step_transition(step_id)
     if err is not None:
         return err
+    if step.status is StepStatus.PAUSED:
+        return jsonify(experiment_to_dict(experiment))
 
     scheduler.handle_step_pause(step_id)
     _emit_experiment_update(experiment)
@@ -425,18 +639,24 @@ def complete_step(step_id):
     step, experiment, err = _authorize_step_transition(step_id)
     if err is not None:
         return err
-
-    # Snapshot per-step status BEFORE the transition. handle_step_complete
-    # runs update_ready_status internally, which can flip dependents to
-    # READY -- we diff against this snapshot to fan out ``step_ready``
-    # notifications for exactly the steps that just unblocked.
-    prev_status_map = _snapshot_step_statuses(experiment)
-    scheduler.handle_step_complete(step_id)
+    if step.status is StepStatus.COMPLETED:
+        # Retried complete: don't re-send step_completed.
+        return jsonify(experiment_to_dict(experiment))
+
+    # handle_step_complete runs update_ready_status internally, which can
+    # flip dependents to READY; it returns exactly the steps that unblocked
+    # so we can fan out ``step_ready`` notifications for them.
+    released = scheduler.handle_step_complete(step_id)
+    if step.status is not StepStatus.COMPLETED:
+        # The step rejected the transition (e.g. it never started).
+        return jsonify(experiment_to_dict(experiment))
 
     # Notification fan-out (U7). The completed step gets one ``step_completed``
     # notification; each newly-READY dependent gets its own ``step_ready``.
-    _emit_step_completed_notification(step, experiment)
-    _emit_step_ready_notifications(experiment, prev_status_map)
+    # Batched so the owner gets one socket frame however many unblocked.
+    with notification_service.batch():
+        _emit_step_completed_notification(step, experiment)
+        _emit_step_ready_notifications(experiment, released)
 
     _emit_experiment_update(experiment)
     return jsonify(experiment_to_dict(experiment))
@@ -461,32 +681,122 @@ def skip_step(step_id):
     step, experiment, err = _authorize_step_transition(step_id)
     if err is not None:
         return err
+    if step.status is StepStatus.SKIPPED:
+        return jsonify(experiment_to_dict(experiment))
 
-    # Drive the transition through the dataclass so ``elapsed_time`` /
-    # ``actual_*`` stay coherent (a half-run step that gets skipped keeps the
-    # work it accumulated, but no end time).
-    prev_status_map = _snapshot_step_statuses(experiment)
-    step.update_status(StepStatus.SKIPPED)
-    # Persist the new status and recompute READY for dependents.
-    scheduler._persist_step_state(step)
-    scheduler.update_ready_status()
-    try:
-        for s in scheduler.schedule.values():
-            scheduler._persist_step_state(s)
-    except RuntimeError:
-        # No app context (test helpers occasionally hit this); the in-memory
-        # cache still reflects the change.
-        pass
+    released = scheduler.handle_step_skip(step_id)
+    if step.status is not StepStatus.SKIPPED:
+        return jsonify(experiment_to_dict(experiment))
 
     # Notification fan-out (U7). Skip is treated like completion for
     # downstream-dependent purposes -- a skipped step is "done blocking"
     # whether or not it ran to completion.
-    _emit_step_completed_notification(step, experiment)
-    _emit_step_ready_notifications(experiment, prev_status_map)
+    with notification_service.batch():
+        _emit_step_completed_notification(step, experiment)
+        _emit_step_ready_notifications(experiment, released)
 
     _emit_experiment_update(experiment)
     return jsonify(experiment_to_dict(experiment))
 
+
+# Batch transitions: event -> (Scheduler method, accepts a client timestamp,
+# takes a time argument). Timed events without a client timestamp share one
+# clock read per batch.
+_STEP_EVENT_HANDLERS = {
+    'start': (Scheduler.handle_step_start, True, True),
+    'pause': (Scheduler.handle_step_pause, False, True),
+    'complete': (Scheduler.handle_step_complete, True, True),
+    'skip': (Scheduler.handle_step_skip, False, False),
+}
+# Events after which dependents may have become READY.
+_UNBLOCKING_EVENTS = frozenset(('complete', 'skip'))
+
+
+@app.route('/api/steps/events', methods=['POST'])
+@jwt_required()
+def apply_step_events():
+    """Apply several step transitions in one request.
+
+    Body: ``[{"step_id": ..., "event": "start"|"pause"|"complete"|"skip",
+    "timestamp": <ISO-8601, optional>}, ...]``, applied in order.
+
+    Every event is validated and authorized before any is applied, so a bad
+    entry rejects the whole batch with the same 400/403/404 the single-step
+    routes return. The transitions then run under one scheduler lock, and
+    each touched experiment is serialized and broadcast once. Returns the
+    touched experiments as a JSON array, in first-touched order.
+    """
+    events = request.get_json(silent=True)
+    if not isinstance(events, list) or not events:
+        return jsonify({'error': 'Expected a non-empty list of step events'}), 400
+
+    planned = []
+    for event in events:
+        if not isinstance(event, dict):
+            return jsonify({'error': 'Each step event must be an object'}), 400
+        name = event.get('event')
+        handler = _STEP_EVENT_HANDLERS.get(name)
+        if handler is None:
+            return jsonify({'error': f'Unknown step event: {name!r}'}), 400
+        handle, accepts_timestamp, timed = handler
+        timestamp = None
+        if accepts_timestamp and event.get('timestamp') is not None:
+            try:
+                timestamp = datetime.fromisoformat(event['timestamp'])
+            except (TypeError, ValueError):
+                return jsonify({'error': 'Invalid timestamp'}), 400
+            if timestamp.tzinfo is not None:
+                # Step times are naive local time; an aware value (e.g. the
+                # ``...Z`` from JS ``toISOString``) would break later
+                # arithmetic, so convert it to that convention.
+                timestamp = timestamp.astimezone().replace(tzinfo=None)
+        step_id = event.get('step_id')
+        step, experiment, err = _authorize_step_transition(step_id)
+        if err is not None:
+            return err
+        planned.append((name, handle, timed, step_id, step, experiment, timestamp))
+
+    # experiment_id -> (experiment, steps released by its events); only
+    # experiments where some event changed state are broadcast.
+    touched = {}
+    changed = set()
+    payload = []
+    # All notifications from the batch go out as one emit per user.
+    with notification_service.batch():
+        with scheduler.locked():
+            now = datetime.now()
+            for name, handle, timed, step_id, step, experiment, timestamp in planned:
+                if experiment.id not in touched:
+                    touched[experiment.id] = (experiment, [])
+                # Checked at apply time: an earlier event in the batch may
+                # have moved the step.
+                target = _EVENT_TARGET_STATUS[name]
+                if step.status is target:
+                    continue
+                if timed:
+                    released = handle(scheduler, step_id, timestamp or now)
+                else:
+                    released = handle(scheduler, step_id)
+                touched[experiment.id][1].extend(released)
+                # The step may have rejected the transition (e.g. completing
+                # a PENDING step); only a real change is announced.
+                if step.status is not target:
+                    continue
+                changed.add(experiment.id)
+                if name in _UNBLOCKING_EVENTS:
+                    _emit_step_completed_notification(step, experiment)
+
+        for experiment, released in touched.values():
+            if experiment.id in changed:
+                # A step released and then started within the same batch is
+                # no longer waiting; don't announce it as ready.
+                _emit_step_ready_notifications(
+                    experiment, [s for s in released if s.status is StepStatus.READY]
+                )
+                _emit_experiment_update(experiment)
+            payload.append(experiment_to_dict(experiment))
+    return jsonify(payload)
+
 # Add a route to get user's experiments
 @app.route('/api/user/experiments', methods=['GET'])
 @jwt_required()
@@ -494,32 +804,47 @@ def get_user_experiments():
     username = get_jwt_identity()
 
     # Owned experiments come from the DB (no more scheduler.user_experiments).
-    owned_orms = ExperimentORM.query.filter_by(owner=username).all()
-    experiments = []
-    seen_ids = set()
-    for orm in owned_orms:
-        # Pull from the cache if present (it carries any in-flight runtime
-        # state); otherwise fall back to the ORM-converted dataclass.
-        exp = scheduler.experiments.get(orm.id) or orm.to_dataclass()
-        experiments.append(experiment_to_dict(exp))
-        seen_ids.add(orm.id)
-
+    # Only the IDs are queried: cached experiments never need their rows.
+    owned_ids = [
+        exp_id for (exp_id,) in
+        db.session.query(ExperimentORM.id).filter_by(owner=username).all()
+    ]
     # Shared experiments still live on the user dataclass for now (U3 will
     # normalize this into a real share table).
     user = get_user(username)
-    if user:
-        for exp_id in user.shared_experiments:
-            if exp_id in seen_ids:
-                continue
-            shared = scheduler.experiments.get(exp_id)
-            if shared is None:
-                shared_orm = db.session.get(ExperimentORM, exp_id)
-                shared = shared_orm.to_dataclass() if shared_orm else None
-            if shared is not None:
-                experiments.append(experiment_to_dict(shared))
-                seen_ids.add(exp_id)
+    shared_ids = list(user.shared_experiments) if user else []
 
-    return jsonify(experiments)
+    experiments = []
+    # A freshly converted ORM row always reads version 0, so a list that
+    # needed one can't be validated by version and goes out without an ETag.
+    all_cached = True
+    # dict.fromkeys: owned first, then shared, each ID serialized once.
+    for exp_id in dict.fromkeys(owned_ids + shared_ids):
+        # Pull from the cache if present (it carries any in-flight runtime
+        # state); otherwise fall back to the ORM-converted dataclass.
+        exp = scheduler.experiments.get(exp_id)
+        if exp is None:
+            all_cached = False
+            orm = db.session.get(ExperimentORM, exp_id)
+            exp = orm.to_dataclass() if orm else None
+        if exp is not None:
+            experiments.append(exp)
+
+    epoch = _wants_epoch_times()
+    etag = _experiments_etag(experiments, 'epoch' if epoch else 'iso') if all_cached else None
+    if etag is not None:
+        not_modified = _not_modified(etag)
+        if not_modified is not None:
+            return not_modified
+
+    # Join the cached per-experiment encodings rather than re-encoding.
+    response = Response(
+        b'[' + b','.join(experiment_to_json(exp, epoch) for exp in experiments) + b']',
+        mimetype='application/json',
+    )
+    return _set_etag(response, etag) if etag is not None else response
+
+_VALID_PERMISSIONS = frozenset(('view', 'edit'))
 
 # Add route to share an experiment
 @app.route('/api/experiments/<experiment_id>/share', methods=['POST'])
@@ -534,7 +859,7 @@ def share_experiment(experiment_id):
     if not share_with_username:
         return jsonify({"error": "Username to share with is required"}), 400
     
-    if permission not in ['view', 'edit']:
+    if permission not in _VALID_PERMISSIONS:
         return jsonify({"error": "Permission must be 'view' or 'edit'"}), 400
     
     # Get experiment
@@ -553,6 +878,7 @@ def share_experiment(experiment_id):
     
     # Share the experiment (in-memory + DB).
     experiment.shared_with[share_with_username] = permission
+    experiment.mark_dirty()
     share_with_user.shared_experiments[experiment_id] = permission
 
     # Persist the experiment's shared_with map.
@@ -582,6 +908,11 @@ def export_experiment(experiment_id):
     if not experiment or not can_view_experiment(user, experiment):
         return jsonify({"error": "Experiment not found"}), 404
 
+    etag = _experiments_etag([experiment], 'export')
+    not_modified = _not_modified(etag)
+    if not_modified is not None:
+        return not_modified
+
     # Convert to exportable format (strip user-specific data)
     export_data = experiment_to_dict(experiment)
 
@@ -591,27 +922,18 @@ def export_experiment(experiment_id):
     if 'shared_with' in export_data:
         del export_data['shared_with']
     
-    # Create a temporary file
-    fd, path = tempfile.mkstemp(suffix='.json')
-    try:
-        with os.fdopen(fd, 'w') as tmp:
-            json.dump(export_data, tmp, indent=2)
-        
-        # Return the file as an attachment
-        return send_file(
-            path,
-            as_attachment=True,
-            download_name=f"{experiment.name.replace(' ', '_')}_export.json",
-            mimetype='application/json'
-        )
-    except Exception as e:
-        return jsonify({"error": f"Export failed: {str(e)}"}), 500
-    finally:
-        # Ensure the temp file is removed after response
-        try:
-            os.remove(path)
-        except:
-            pass
+    # Encode in memory and send as an attachment; no temp file round-trip.
+    response = Response(dumps_bytes(export_data, indent=True), mimetype='application/json')
+    # Keyword form lets Werkzeug quote / RFC 5987-encode the name, as
+    # send_file did.
+    response.headers.set(
+        'Content-Disposition',
+        'attachment',
+        filename=f"{experiment.name.replace(' ', '_')}_export.json",
+    )
+    return _set_etag(response, etag)
+
+_IMPORT_REQUIRED_FIELDS = ('name', 'steps')
 
 # Add import experiment endpoint
 @app.route('/api/experiments/import', methods=['POST'])
@@ -631,12 +953,12 @@ def import_experiment():
         return jsonify({"error": "Only JSON files are supported"}), 400
     
     try:
-        # Parse the file
-        data = json.load(file)
+        # Parse the file. ``app.json`` is orjson-backed when available; its
+        # JSONDecodeError subclasses the stdlib one caught below.
+        data = app.json.loads(file.read())
         
         # Basic validation
-        required_fields = ['name', 'steps']
-        for field in required_fields:
+        for field in _IMPORT_REQUIRED_FIELDS:
             if field not in data:
                 return jsonify({"error": f"Invalid experiment format: missing '{field}'"}), 400
         
@@ -669,7 +991,7 @@ def import_experiment():
         # Calculate initial schedule
         if experiment.steps:
             start_time = datetime.now()
-            scheduler.calculate_initial_schedule(start_time=start_time)
+            scheduler.calculate_initial_schedule(start_time=start_time, only=experiment.id)
 
         return jsonify(experiment_to_dict(experiment)), 201
 
@@ -706,7 +1028,7 @@ def create_template():
         return jsonify({"error": "Only the owner can create templates from this experiment"}), 403
 
     template = TemplateORM(
-        id=str(uuid.uuid4()),
+        id=new_id(),
         owner=username,
         name=template_name,
         source_experiment_id=experiment_id,
@@ -717,11 +1039,23 @@ def create_template():
 
     return jsonify(template.to_dict()), 201
 
+def _get_owned_template(template_id, username):
+    """Return ``username``'s template by primary key, or None.
+
+    ``session.get`` is served from the identity map when the row is already
+    loaded in this session, and is a single PK probe otherwise. Someone
+    else's template reads as missing, same as a bad ID.
+    """
+    template = db.session.get(TemplateORM, template_id)
+    if template is None or template.owner != username:
+        return None
+    return template
+
 @app.route('/api/templates/<template_id>', methods=['DELETE'])
 @jwt_required()
 def delete_template(template_id):
     username = get_jwt_identity()
-    template = TemplateORM.query.filter_by(id=template_id, owner=username).first()
+    template = _get_owned_template(template_id, username)
     if template is None:
         return jsonify({"error": "Template not found"}), 404
     db.session.delete(template)
@@ -733,7 +1067,7 @@ def delete_template(template_id):
 def create_from_template(template_id):
     username = get_jwt_identity()
 
-    template = TemplateORM.query.filter_by(id=template_id, owner=username).first()
+    template = _get_owned_template(template_id, username)
     if template is None:
         return jsonify({"error": "Template not found"}), 404
 
@@ -761,7 +1095,7 @@ def create_from_template(template_id):
 
     if experiment.steps:
         start_time = datetime.now()
-        scheduler.calculate_initial_schedule(start_time=start_time)
+        scheduler.calculate_initial_schedule(start_time=start_time, only=experiment.id)
 
     return jsonify(experiment_to_dict(experiment)), 201
 
@@ -796,7 +1130,10 @@ def get_notifications():
     unread_only = request.args.get('unread_only', 'false').lower() == 'true'
     
     notifications = notification_service.get_user_notifications(username, unread_only)
-    return jsonify([n.to_dict() for n in notifications])
+    return Response(
+        b'[' + b','.join(n.to_json_bytes() for n in notifications) + b']',
+        mimetype='application/json',
+    )
 
 @app.route('/api/notifications/<notification_id>/read', methods=['POST'])
 @jwt_required()
@@ -1,9 +1,20 @@
-import uuid
+import heapq
+import logging
+import os
+import sys
+import threading
 from datetime import datetime, timedelta
 from enum import Enum
-from typing import List, Optional, Dict, Any
+from types import MappingProxyType
+from typing import List, Mapping, Optional, Dict, Any, Set
 import bcrypt
 
+try:
+    from argon2 import PasswordHasher
+    from argon2.exceptions import InvalidHashError, VerificationError
+except ImportError:
+    PasswordHasher = None
+
 from sqlalchemy import (
     Column,
     String,
@@ -14,12 +25,57 @@ from sqlalchemy import (
     Table,
     Text,
     Boolean,
+    Index,
     JSON,
 )
 from sqlalchemy.orm import relationship
 
 from db import db
 
+logger = logging.getLogger(__name__)
+
+# IDs are drawn from a per-thread pool filled by one os.urandom call per
+# batch, instead of one syscall and a UUID object per new Step/Experiment.
+_ID_BATCH = 256
+_id_local = threading.local()
+
+
+def _id_batch() -> List[str]:
+    buf = bytearray(os.urandom(16 * _ID_BATCH))
+    for i in range(0, len(buf), 16):
+        # Version 4, RFC 4122 variant -- same bits uuid.uuid4() sets.
+        buf[i + 6] = (buf[i + 6] & 0x0F) | 0x40
+        buf[i + 8] = (buf[i + 8] & 0x3F) | 0x80
+    h = buf.hex()
+    # Interned (see ``_intern_ids``) so dependency lists share these objects.
+    return [
+        sys.intern(f"{h[j:j + 8]}-{h[j + 8:j + 12]}-{h[j + 12:j + 16]}-{h[j + 16:j + 20]}-{h[j + 20:j + 32]}")
+        for j in range(0, len(h), 32)
+    ]
+
+
+def _intern_ids(ids) -> List[str]:
+    """``ids`` as a list of interned strings.
+
+    Step IDs are held both as ``Step.id`` and in every dependent's
+    ``dependencies`` list. Interning makes those one shared object instead of
+    a 36-character copy per reference, and lets dict lookups by a dependency
+    ID match on identity before comparing characters.
+    """
+    return [sys.intern(i) for i in ids]
+
+
+def new_id() -> str:
+    """A random ID in ``str(uuid.uuid4())`` form."""
+    pool = getattr(_id_local, "pool", None)
+    if not pool:
+        pool = _id_local.pool = _id_batch()
+    return pool.pop()
+
+
+# A forked worker must not hand out IDs left in its parent's pool.
+os.register_at_fork(after_in_child=lambda: _id_local.__dict__.clear())
+
 
 class StepStatus(Enum):
     PENDING = "pending"
@@ -38,7 +94,74 @@ class StepType(Enum):
     # Removed WAIT
     # Add more types as needed
 
+# Wire/DB value -> member, for hot paths that would otherwise go through
+# ``Enum.__call__`` once per step (payload parsing, ORM hydration).
+_STEP_STATUS_MAP: Dict[str, StepStatus] = {m.value: m for m in StepStatus}
+_STEP_TYPE_MAP: Dict[str, StepType] = {m.value: m for m in StepType}
+
+# Transition guards, built once rather than as a list literal per call.
+_STARTABLE_STATUSES = frozenset((StepStatus.READY, StepStatus.PAUSED))
+_COMPLETABLE_STATUSES = frozenset((StepStatus.RUNNING, StepStatus.PAUSED))
+_UNPAUSABLE_TYPES = frozenset(
+    (StepType.FIXED_DURATION, StepType.FIXED_START, StepType.AUTOMATED_TASK)
+)
+
+# Shared read-only stand-in for a step with no metadata (most of them), so
+# an empty dict isn't allocated per Step. It can't be written through; code
+# that sets step metadata assigns a new dict.
+_EMPTY_META: Mapping[str, Any] = MappingProxyType({})
+
+def _clock_str(value: Optional[datetime]) -> Optional[str]:
+    """Render ``value`` as ``HH:MM:SS`` (None passes through)."""
+    return value.strftime("%H:%M:%S") if value else None
+
+
+def _epoch(value: Optional[datetime]) -> Optional[float]:
+    """``value`` as POSIX seconds (None passes through)."""
+    return value.timestamp() if value else None
+
+
 class Step:
+    # Fixed attribute layout: no per-instance ``__dict__``, which matters for
+    # experiments with thousands of steps. Underscored slots back the
+    # properties below and their derived caches.
+    __slots__ = (
+        "id",
+        "name",
+        "_duration",
+        "_duration_seconds",
+        "_step_type",
+        "_type_value",
+        "dependencies",
+        "notes",
+        "metadata",
+        "resource_needed",
+        "_scheduled_start_time",
+        "_scheduled_start_str",
+        "_scheduled_start_ts",
+        "_sort_key",
+        "_scheduled_end_time",
+        "_scheduled_end_str",
+        "_scheduled_end_ts",
+        "_actual_start_time",
+        "_actual_start_str",
+        "_actual_start_ts",
+        "first_start_time",
+        "_actual_end_time",
+        "_actual_end_str",
+        "_actual_end_ts",
+        "_elapsed_time",
+        "_elapsed_s",
+        "_status",
+        "_status_value",
+        "latest_allowed_start_time",
+        "earliest_possible_start_time",
+        "_cached_dict",
+        "_cached_epoch_dict",
+        "_static_dict",
+        "_dirty",
+    )
+
     def __init__(
         self,
         name: str,
@@ -50,18 +173,18 @@ class Step:
         metadata: Optional[Dict[str, Any]] = None, # For extra info specific to a step type
         resource_needed: Optional[str] = None # e.g., 'microscope', 'user_attention', 'oven'
     ):
-        self.id: str = str(uuid.uuid4()) # Unique identifier for the step
+        self.id: str = new_id() # Unique identifier for the step
         self.name: str = name
         self.duration: timedelta = duration # Expected duration
         self.step_type: StepType = step_type
-        self.dependencies: List[str] = dependencies if dependencies else []
+        self.dependencies: List[str] = _intern_ids(dependencies) if dependencies else []
         self.notes: Optional[str] = notes
-        self.metadata: Dict[str, Any] = metadata if metadata else {}
+        self.metadata: Mapping[str, Any] = metadata if metadata else _EMPTY_META
         self.resource_needed: Optional[str] = resource_needed
 
         # Default resource needed based on type (can be overridden)
         if self.resource_needed is None:
-            if self.step_type == StepType.TASK:
+            if self.step_type is StepType.TASK:
                  self.resource_needed = 'user_attention'
             # Add other defaults if needed (e.g., AUTOMATED_TASK for 'microscope')
 
@@ -86,6 +209,140 @@ class Step:
         self.latest_allowed_start_time: Optional[datetime] = None # Calculated by scheduler
         self.earliest_possible_start_time: Optional[datetime] = None # Calculated by scheduler
 
+        # Serialization cache (see serializers.step_to_dict). ``_dirty`` is
+        # flipped by every state transition so the next serialize rebuilds.
+        # ``_static_dict`` holds the wire fields that only change on an edit
+        # (name, type, duration, ...); transitions reuse it.
+        self._cached_dict: Optional[Dict[str, Any]] = None
+        self._cached_epoch_dict: Optional[Dict[str, Any]] = None
+        self._static_dict: Optional[Dict[str, Any]] = None
+        self._dirty: bool = True
+
+    def mark_dirty(self):
+        """Invalidate the cached wire dict after an out-of-band mutation."""
+        self._dirty = True
+
+    def mark_edited(self):
+        """Like ``mark_dirty``, after an edit to name/notes/deps/resource."""
+        self._static_dict = None
+        self._dirty = True
+
+    # ``status`` / ``step_type`` are properties that materialize the enum's
+    # string value once per assignment; serializers read ``_status_value`` /
+    # ``_type_value`` instead of paying the ``Enum.value`` descriptor per
+    # access. Assigning ``status`` also marks the step dirty, so any
+    # transition -- including a direct assignment -- invalidates the cache.
+    @property
+    def status(self) -> StepStatus:
+        return self._status
+
+    @status.setter
+    def status(self, value: StepStatus):
+        self._status = value
+        self._status_value: str = value.value
+        self._dirty = True
+
+    @property
+    def duration(self) -> timedelta:
+        return self._duration
+
+    @duration.setter
+    def duration(self, value: timedelta):
+        self._duration = value
+        # Wire/ORM value, computed once per assignment rather than via
+        # ``total_seconds()`` on every serialize and persist.
+        self._duration_seconds: float = value.total_seconds() if value else 0.0
+        self._static_dict = None
+        self._dirty = True
+
+    @property
+    def step_type(self) -> StepType:
+        return self._step_type
+
+    @step_type.setter
+    def step_type(self, value: StepType):
+        self._step_type = value
+        self._type_value: str = value.value
+        self._static_dict = None
+        self._dirty = True
+
+    # The four wall-clock fields are properties so their derived caches stay
+    # in step: ``_sort_key`` orders schedule listings, the ``_*_str``
+    # attributes cache the ``HH:MM:SS`` rendering print_schedule emits
+    # (filled on first read by ``clock_str``, cleared on write), and
+    # the ``_*_ts`` attributes hold POSIX seconds for float-only arithmetic
+    # (conflict overlap, epoch-format serialization). The datetimes remain
+    # the source of truth at the API and DB boundaries. Like ``status``,
+    # assigning any of them marks the step dirty.
+    @property
+    def scheduled_start_time(self) -> Optional[datetime]:
+        return self._scheduled_start_time
+
+    @scheduled_start_time.setter
+    def scheduled_start_time(self, value: Optional[datetime]):
+        self._scheduled_start_time = value
+        self._scheduled_start_str = None
+        self._scheduled_start_ts = _epoch(value)
+        # Precomputed ordering key so schedule listings can sort with
+        # ``operator.attrgetter('_sort_key')`` instead of a Python lambda.
+        self._sort_key = value or datetime.max
+        self._dirty = True
+
+    @property
+    def scheduled_end_time(self) -> Optional[datetime]:
+        return self._scheduled_end_time
+
+    @scheduled_end_time.setter
+    def scheduled_end_time(self, value: Optional[datetime]):
+        self._scheduled_end_time = value
+        self._scheduled_end_str = None
+        self._scheduled_end_ts = _epoch(value)
+        self._dirty = True
+
+    @property
+    def actual_start_time(self) -> Optional[datetime]:
+        return self._actual_start_time
+
+    @actual_start_time.setter
+    def actual_start_time(self, value: Optional[datetime]):
+        self._actual_start_time = value
+        self._actual_start_str = None
+        self._actual_start_ts = _epoch(value)
+        self._dirty = True
+
+    @property
+    def actual_end_time(self) -> Optional[datetime]:
+        return self._actual_end_time
+
+    @actual_end_time.setter
+    def actual_end_time(self, value: Optional[datetime]):
+        self._actual_end_time = value
+        self._actual_end_str = None
+        self._actual_end_ts = _epoch(value)
+        self._dirty = True
+
+    def clock_str(self, field: str) -> Optional[str]:
+        """``HH:MM:SS`` for ``field`` (e.g. ``"scheduled_start"``), or None.
+
+        Rendered on first read after the time changes and cached until the
+        next assignment, so only the debug schedule printout pays for it.
+        """
+        slot = f"_{field}_str"
+        text = getattr(self, slot)
+        if text is None:
+            text = _clock_str(getattr(self, f"_{field}_time"))
+            setattr(self, slot, text)
+        return text
+
+    @property
+    def elapsed_time(self) -> timedelta:
+        return self._elapsed_time
+
+    @elapsed_time.setter
+    def elapsed_time(self, value: timedelta):
+        self._elapsed_time = value
+        self._elapsed_s: float = value.total_seconds() if value else 0.0
+
     def start(self, start_time: Optional[datetime] = None):
         """Marks the step as started.
 
@@ -102,9 +359,8 @@ class Step:
           slice. Resetting elapsed_time here would silently drop prior work.
           ``first_start_time`` is preserved across resumes.
         """
-        if self.status not in [StepStatus.READY, StepStatus.PAUSED]:
-             # Consider raising an error or logging a warning
-             print(f"Warning: Cannot start step '{self.name}' with status {self.status.value}")
+        if self._status not in _STARTABLE_STATUSES:
+             logger.warning("Cannot start step '%s' with status %s", self.name, self._status_value)
              return
 
         self.actual_start_time = start_time or datetime.now()
@@ -114,45 +370,52 @@ class Step:
         if self.first_start_time is None:
             self.first_start_time = self.actual_start_time
         self.status = StepStatus.RUNNING
-        print(f"Step '{self.name}' started at {self.actual_start_time}")
+        logger.debug("Step '%s' started at %s", self.name, self._actual_start_time)
+
+    def pause(self, now: Optional[datetime] = None):
+        """Pauses the step, if supported by its type.
 
-    def pause(self):
-        """Pauses the step, if supported by its type."""
+        ``now`` lets a caller applying several transitions share one clock
+        read; it defaults to the current time.
+        """
         # FIXED_DURATION, FIXED_START, and AUTOMATED_TASK steps cannot be paused.
-        if self.step_type in [StepType.FIXED_DURATION, StepType.FIXED_START, StepType.AUTOMATED_TASK]:
-            print(f"Warning: Cannot pause step '{self.name}' of type {self.step_type.value}")
+        if self._step_type in _UNPAUSABLE_TYPES:
+            logger.warning("Cannot pause step '%s' of type %s", self.name, self._type_value)
             return
 
-        if self.status == StepStatus.RUNNING:
-            now = datetime.now()
+        if self.status is StepStatus.RUNNING:
+            now = now or datetime.now()
             self.elapsed_time += now - self.actual_start_time # Add time since last start/resume
             self.status = StepStatus.PAUSED
-            print(f"Step '{self.name}' paused at {now}. Total elapsed: {self.elapsed_time}")
+            logger.debug("Step '%s' paused at %s. Total elapsed: %s", self.name, now, self._elapsed_time)
         else:
-             print(f"Warning: Cannot pause step '{self.name}' with status {self.status.value}")
+             logger.warning("Cannot pause step '%s' with status %s", self.name, self._status_value)
 
 
     def complete(self, end_time: Optional[datetime] = None):
         """Marks the step as completed."""
-        if self.status not in [StepStatus.RUNNING, StepStatus.PAUSED]: # Allow completing paused steps? Maybe.
-            print(f"Warning: Cannot complete step '{self.name}' with status {self.status.value}")
+        if self._status not in _COMPLETABLE_STATUSES: # Allow completing paused steps? Maybe.
+            logger.warning("Cannot complete step '%s' with status %s", self.name, self._status_value)
             return
 
         self.actual_end_time = end_time or datetime.now()
-        if self.status == StepStatus.RUNNING:
+        if self.status is StepStatus.RUNNING:
             # Add any remaining time since last start/resume
              self.elapsed_time += self.actual_end_time - self.actual_start_time
 
         self.status = StepStatus.COMPLETED
-        print(f"Step '{self.name}' completed at {self.actual_end_time}. Final elapsed: {self.elapsed_time}")
+        logger.debug(
+            "Step '%s' completed at %s. Final elapsed: %s",
+            self.name, self._actual_end_time, self._elapsed_time,
+        )
 
 
     def update_status(self, status: StepStatus):
         """Allows manually setting status (e.g., to SKIPPED or ERROR)."""
         self.status = status
-        print(f"Step '{self.name}' status updated to {status.value}")
+        logger.debug("Step '%s' status updated to %s", self.name, self._status_value)
 
-    def get_expected_end_time(self) -> Optional[datetime]:
+    def get_expected_end_time(self, now: Optional[datetime] = None) -> Optional[datetime]:
         """Compute the expected wall-clock end time, accounting for elapsed.
 
         Cases:
@@ -171,22 +434,19 @@ class Step:
           ``scheduled_start_time + duration`` if we have one, else ``None``.
 
         Remaining time is floored at zero so a step that's already over its
-        budget doesn't return an end time before its start.
+        budget doesn't return an end time before its start. ``now`` (for the
+        PAUSED case) defaults to the current time.
         """
-        if self.status == StepStatus.COMPLETED and self.actual_end_time:
+        if self.status is StepStatus.COMPLETED and self.actual_end_time:
             return self.actual_end_time
 
-        if self.status == StepStatus.RUNNING and self.actual_start_time:
-            remaining = self.duration - self.elapsed_time
-            if remaining < timedelta(0):
-                remaining = timedelta(0)
-            return self.actual_start_time + remaining
+        if self.status is StepStatus.RUNNING and self.actual_start_time:
+            remaining = max(self._duration_seconds - self._elapsed_s, 0.0)
+            return self.actual_start_time + timedelta(seconds=remaining)
 
-        if self.status == StepStatus.PAUSED:
-            remaining = self.duration - self.elapsed_time
-            if remaining < timedelta(0):
-                remaining = timedelta(0)
-            return datetime.now() + remaining
+        if self.status is StepStatus.PAUSED:
+            remaining = max(self._duration_seconds - self._elapsed_s, 0.0)
+            return (now or datetime.now()) + timedelta(seconds=remaining)
 
         if self.scheduled_start_time:
             return self.scheduled_start_time + self.duration
@@ -194,51 +454,195 @@ class Step:
         return None # Not enough info to determine
 
     def __repr__(self):
-        return (f"Step(id={self.id}, name='{self.name}', status={self.status.value}, "
+        return (f"Step(id={self.id}, name='{self.name}', status={self._status_value}, "
                 f"scheduled_start={self.scheduled_start_time}, actual_start={self.actual_start_time}, "
                 f"duration={self.duration})")
 
 # We will also need an Experiment class to hold these steps
 class Experiment:
+    # ``owner`` / ``shared_with`` are attached by the route handlers after
+    # construction; they stay unset (``hasattr`` is False) until then.
+    __slots__ = (
+        "id",
+        "name",
+        "description",
+        "steps",
+        "owner",
+        "shared_with",
+        "version",
+        "_cached_dict",
+        "_cached_epoch_dict",
+        "_cached_json",
+        "_cached_epoch_json",
+        "_dirty",
+        "_topo_order",
+        "_topo_index",
+        "_topo_external",
+    )
+
     def __init__(self, name: str, description: Optional[str] = None):
-        self.id: str = str(uuid.uuid4())
+        self.id: str = new_id()
         self.name: str = name
         self.description: Optional[str] = description
         self.steps: Dict[str, Step] = {} # Store steps by their ID for easy lookup
         # Maybe add overall experiment status, start/end times etc. later
 
+        # Serialization cache (see serializers.experiment_to_dict). Step-level
+        # changes are tracked on each Step; this flag covers top-level fields
+        # (name, description, sharing) and step membership. ``version`` is
+        # bumped each time the serializer finds the cache stale, so it
+        # identifies one rendering of the experiment.
+        self.version: int = 0
+        self._cached_dict: Optional[Dict[str, Any]] = None
+        self._cached_epoch_dict: Optional[Dict[str, Any]] = None
+        self._cached_json: Optional[bytes] = None
+        self._cached_epoch_json: Optional[bytes] = None
+        self._dirty: bool = True
+        # Kahn order of step IDs, computed lazily by ``topo_order`` and
+        # dropped whenever step membership or dependencies change. Alongside
+        # it: each ordered step's position, and the dependency IDs that
+        # pointed outside the experiment when it was built.
+        self._topo_order: Optional[List[str]] = None
+        self._topo_index: Dict[str, int] = {}
+        self._topo_external: Set[str] = set()
+
+    def mark_dirty(self):
+        """Invalidate the cached wire dict after a top-level mutation."""
+        self._dirty = True
+
     def add_step(self, step: Step):
         if step.id in self.steps:
-            print(f"Warning: Step with ID {step.id} already exists in experiment '{self.name}'.")
+            logger.warning("Step with ID %s already exists in experiment '%s'.", step.id, self.name)
             return
         self.steps[step.id] = step
-        print(f"Step '{step.name}' added to experiment '{self.name}'.")
+        self._dirty = True
+        if self._topo_order is not None and not self._append_to_topo_order(step):
+            self._topo_order = None
+        logger.debug("Step '%s' added to experiment '%s'.", step.name, self.name)
+
+    def _append_to_topo_order(self, step: Step) -> bool:
+        """Extend the cached order with a just-added step, if that is exact.
+
+        A full rebuild would place the new step last (it has the highest
+        insertion index) provided nothing already here depends on it and
+        each of its in-experiment dependencies is already ordered. Otherwise
+        returns False and the caller drops the cache.
+        """
+        if step.id in self._topo_external:
+            return False
+        index = self._topo_index
+        external = []
+        for dep_id in step.dependencies:
+            if dep_id not in index:
+                if dep_id in self.steps:
+                    return False
+                external.append(dep_id)
+        index[step.id] = len(self._topo_order)
+        self._topo_order.append(step.id)
+        self._topo_external.update(external)
+        return True
 
     def get_step(self, step_id: str) -> Optional[Step]:
         return self.steps.get(step_id)
 
+    def topo_order(self) -> List[str]:
+        """Return (and cache) the Kahn order of this experiment's step IDs.
+
+        Ready steps are drawn from a min-heap keyed by insertion index, so
+        among steps whose dependencies are satisfied the one the user added
+        first always comes first -- the order is stable regardless of which
+        dependency happened to release a step.
+
+        Only edges between steps of this experiment are ordered; dependencies
+        pointing elsewhere are resolved by end time at scheduling time. Steps
+        on a cycle never reach in-degree zero and are left out of the order.
+        ``add_step`` extends the cache in place when the new step simply goes
+        last, and drops it otherwise; the scheduler drops it whenever it
+        edits dependencies.
+        """
+        if self._topo_order is not None:
+            return self._topo_order
+
+        step_ids = list(self.steps)
+        index = {step_id: i for i, step_id in enumerate(step_ids)}
+        in_degree = [0] * len(step_ids)
+        dependents: Dict[int, List[int]] = {}
+        external: Set[str] = set()
+        for i, step_id in enumerate(step_ids):
+            for dep_id in self.steps[step_id].dependencies:
+                dep_index = index.get(dep_id)
+                if dep_index is not None:
+                    in_degree[i] += 1
+                    dependents.setdefault(dep_index, []).append(i)
+                else:
+                    external.add(dep_id)
+
+        # Built in ascending order, so already a valid heap.
+        heap = [i for i, degree in enumerate(in_degree) if degree == 0]
+        order: List[str] = []
+        while heap:
+            i = heapq.heappop(heap)
+            order.append(step_ids[i])
+            for child in dependents.get(i, ()):
+                in_degree[child] -= 1
+                if in_degree[child] == 0:
+                    heapq.heappush(heap, child)
+
+        self._topo_order = order
+        self._topo_index = {step_id: i for i, step_id in enumerate(order)}
+        self._topo_external = external
+        return order
+
     def __repr__(self):
         return f"Experiment(id={self.id}, name='{self.name}', num_steps={len(self.steps)})"
 
 # Later, we'll add a Scheduler class to manage multiple Experiments and their Steps
 
+# Password hashing cost dominates register/login latency. BCRYPT_ROUNDS tunes
+# bcrypt's work factor (each +1 doubles it); PASSWORD_HASHER=argon2 makes new
+# hashes argon2id when argon2-cffi is installed. Verification dispatches on
+# the stored hash's prefix, so existing hashes keep working after either
+# setting changes.
+_BCRYPT_ROUNDS = int(os.environ.get("BCRYPT_ROUNDS", "12"))
+_argon2 = (
+    PasswordHasher(time_cost=2, memory_cost=19456, parallelism=1)
+    if PasswordHasher is not None else None
+)
+_USE_ARGON2 = os.environ.get("PASSWORD_HASHER", "bcrypt").lower() == "argon2"
+if _USE_ARGON2 and _argon2 is None:
+    logger.warning("PASSWORD_HASHER=argon2 but argon2-cffi is not installed; using bcrypt")
+    _USE_ARGON2 = False
+
+
 class User:
     def __init__(self, username: str, email: str, password: str):
-        self.id: str = str(uuid.uuid4())
+        self.id: str = new_id()
         self.username: str = username
         self.email: str = email
         self.password_hash: str = self._hash_password(password)
         self.shared_experiments: Dict[str, str] = {}  # experiment_id -> permission
 
-    def _hash_password(self, password: str) -> str:
+    def _hash_password(self, password: str, rounds: Optional[int] = None) -> str:
         # Generate a salted hash of the password
+        if _USE_ARGON2:
+            return _argon2.hash(password)
         password_bytes = password.encode('utf-8')
-        salt = bcrypt.gensalt()
+        salt = bcrypt.gensalt(rounds=rounds or _BCRYPT_ROUNDS)
         hashed = bcrypt.hashpw(password_bytes, salt)
         return hashed.decode('utf-8')
 
     def check_password(self, password: str) -> bool:
-        # Check if the provided password matches the stored hash
+        # Check if the provided password matches the stored hash. bcrypt and
+        # argon2-cffi both release the GIL while hashing, so concurrent
+        # logins on a threaded server don't serialize on it.
+        if self.password_hash.startswith('$argon2'):
+            if _argon2 is None:
+                logger.warning("argon2 hash for %s but argon2-cffi is not installed", self.username)
+                return False
+            try:
+                return _argon2.verify(self.password_hash, password)
+            except (VerificationError, InvalidHashError):
+                return False
         password_bytes = password.encode('utf-8')
         hashed_bytes = self.password_hash.encode('utf-8')
         return bcrypt.checkpw(password_bytes, hashed_bytes)
@@ -339,6 +743,15 @@ class ExperimentORM(db.Model):
         # owner / shared_with are extras the route handlers attach -- preserve them.
         exp.owner = self.owner
         exp.shared_with = dict(self.shared_with or {})
+        exp.version = 0
+        exp._cached_dict = None
+        exp._cached_epoch_dict = None
+        exp._cached_json = None
+        exp._cached_epoch_json = None
+        exp._dirty = True
+        exp._topo_order = None
+        exp._topo_index = {}
+        exp._topo_external = set()
         for step_orm in self.steps:
             exp.steps[step_orm.id] = step_orm.to_dataclass()
         return exp
@@ -389,9 +802,9 @@ class StepORM(db.Model):
             id=step.id,
             experiment_id=experiment_id,
             name=step.name,
-            duration_seconds=step.duration.total_seconds() if step.duration else 0.0,
-            step_type=step.step_type.value,
-            status=step.status.value,
+            duration_seconds=step._duration_seconds,
+            step_type=step._type_value,
+            status=step._status_value,
             notes=step.notes,
             resource_needed=step.resource_needed,
             step_metadata=dict(step.metadata or {}),
@@ -413,9 +826,9 @@ class StepORM(db.Model):
         via the association table.
         """
         self.name = step.name
-        self.duration_seconds = step.duration.total_seconds() if step.duration else 0.0
-        self.step_type = step.step_type.value
-        self.status = step.status.value
+        self.duration_seconds = step._duration_seconds
+        self.step_type = step._type_value
+        self.status = step._status_value
         self.notes = step.notes
         self.resource_needed = step.resource_needed
         self.step_metadata = dict(step.metadata or {})
@@ -430,14 +843,14 @@ class StepORM(db.Model):
 
     def to_dataclass(self) -> "Step":
         step = Step.__new__(Step)
-        step.id = self.id
+        step.id = sys.intern(self.id)
         step.name = self.name
         step.duration = timedelta(seconds=self.duration_seconds or 0.0)
-        step.step_type = StepType(self.step_type)
-        step.status = StepStatus(self.status)
+        step.step_type = _STEP_TYPE_MAP[self.step_type]
+        step.status = _STEP_STATUS_MAP[self.status]
         step.notes = self.notes
         step.resource_needed = self.resource_needed
-        step.metadata = dict(self.step_metadata or {})
+        step.metadata = dict(self.step_metadata) if self.step_metadata else _EMPTY_META
         step.scheduled_start_time = self.scheduled_start_time
         step.scheduled_end_time = self.scheduled_end_time
         step.actual_start_time = self.actual_start_time
@@ -447,7 +860,11 @@ class StepORM(db.Model):
         step.earliest_possible_start_time = self.earliest_possible_start_time
         step.latest_allowed_start_time = self.latest_allowed_start_time
         # Dependency IDs are stored on the dataclass as a list of step IDs.
-        step.dependencies = [d.id for d in (self.dependencies or [])]
+        step.dependencies = _intern_ids(d.id for d in (self.dependencies or []))
+        step._cached_dict = None
+        step._cached_epoch_dict = None
+        step._static_dict = None
+        step._dirty = True
         return step
 
 
@@ -475,9 +892,23 @@ class TemplateORM(db.Model):
 
 class NotificationORM(db.Model):
     __tablename__ = "notifications"
+    # A user's notifications are always read newest-first; these indexes
+    # serve both the filter and the ORDER BY, so the query needs no sort
+    # step. With ``is_read`` in the middle, an unread-only listing seeks
+    # straight to the user's unread rows instead of filtering their whole
+    # history.
+    __table_args__ = (
+        Index("ix_notifications_target_user_created_at", "target_user", "created_at"),
+        Index(
+            "ix_notifications_target_user_is_read_created_at",
+            "target_user",
+            "is_read",
+            "created_at",
+        ),
+    )
 
     id = Column(String, primary_key=True)
-    target_user = Column(String, ForeignKey("users.username"), nullable=False, index=True)
+    target_user = Column(String, ForeignKey("users.username"), nullable=False)
     title = Column(String, nullable=False)
     message = Column(Text, nullable=False)
     type = Column(String, nullable=False)
@@ -1,10 +1,12 @@
+from contextlib import contextmanager
 from enum import Enum
-import uuid
+import threading
 from datetime import datetime
 from typing import Dict, List, Optional, Any, Callable
-import json
 
 from db import db
+from models import new_id
+from serializers import dumps_bytes
 
 # Define notification types
 class NotificationType(Enum):
@@ -42,6 +44,8 @@ class ActionType(Enum):
 
 # Notification action class
 class NotificationAction:
+    __slots__ = ("id", "type", "label", "data")
+
     def __init__(self, 
                  action_id: str, 
                  action_type: ActionType, 
@@ -60,8 +64,49 @@ class NotificationAction:
             "data": self.data
         }
 
+    def with_data(self, data: Dict[str, Any]) -> 'NotificationAction':
+        """Copy of this action carrying ``data``, bypassing ``__init__``."""
+        action = NotificationAction.__new__(NotificationAction)
+        action.id = self.id
+        action.type = self.type
+        action.label = self.label
+        action.data = data
+        return action
+
+
+# Prototypes for the actions the type handlers attach. Only ``data`` varies
+# per notification; ``with_data`` stamps out the copies.
+_START_STEP_ACTION = NotificationAction("start_step", ActionType.BUTTON, "Start Step")
+_RESUME_STEP_ACTION = NotificationAction("resume_step", ActionType.BUTTON, "Resume Step")
+_COMPLETE_STEP_ACTION = NotificationAction("complete_step", ActionType.BUTTON, "Mark as Complete")
+_PAUSE_STEP_ACTION = NotificationAction("pause_step", ActionType.BUTTON, "Pause Current Step")
+_PAUSE_CONFLICTING_ACTION = NotificationAction(
+    "pause_conflicting_step", ActionType.BUTTON, "Pause Conflicting Step"
+)
+_VIEW_STEP_ACTION = NotificationAction("view_step", ActionType.LINK, "View Step")
+
 # Main notification class
 class Notification:
+    # One instance per delivered notification per user; a fixed layout keeps
+    # them small when listing a long history.
+    __slots__ = (
+        "id",
+        "title",
+        "message",
+        "type",
+        "priority",
+        "target_users",
+        "experiment_id",
+        "step_id",
+        "metadata",
+        "actions",
+        "delivery_methods",
+        "created_at",
+        "is_read",
+        "is_dismissed",
+        "_cached_dict",
+    )
+
     def __init__(self,
                  title: str,
                  message: str,
@@ -72,8 +117,9 @@ class Notification:
                  step_id: Optional[str] = None,
                  metadata: Optional[Dict[str, Any]] = None,
                  actions: Optional[List[NotificationAction]] = None,
-                 delivery_methods: Optional[List[DeliveryMethod]] = None):
-        self.id = str(uuid.uuid4())
+                 delivery_methods: Optional[List[DeliveryMethod]] = None,
+                 created_at: Optional[datetime] = None):
+        self.id = new_id()
         self.title = title
         self.message = message
         self.type = notification_type
@@ -84,11 +130,30 @@ class Notification:
         self.metadata = metadata or {}
         self.actions = actions or []
         self.delivery_methods = delivery_methods or [DeliveryMethod.IN_APP]
-        self.created_at = datetime.now()
+        # Rehydration passes the stored time, skipping a clock read.
+        self.created_at = created_at or datetime.now()
         self.is_read = False
         self.is_dismissed = False
+        # Everything but the read/dismissed flags is fixed once the type
+        # handler has run, so ``to_dict`` builds the rest once.
+        self._cached_dict: Optional[Dict[str, Any]] = None
     
     def to_dict(self) -> Dict[str, Any]:
+        """Wire dict for this notification.
+
+        Built on first call and reused (as a fresh shallow copy with the
+        current ``is_read`` / ``is_dismissed``), so don't mutate the other
+        fields after serializing.
+        """
+        cached = self._cached_dict
+        if cached is None:
+            cached = self._cached_dict = self._build_dict()
+        out = dict(cached)
+        out["is_read"] = self.is_read
+        out["is_dismissed"] = self.is_dismissed
+        return out
+
+    def _build_dict(self) -> Dict[str, Any]:
         return {
             "id": self.id,
             "title": self.title,
@@ -105,6 +170,14 @@ class Notification:
             "is_read": self.is_read,
             "is_dismissed": self.is_dismissed
         }
+
+    def to_json_bytes(self) -> bytes:
+        """``to_dict`` encoded as UTF-8 JSON (orjson when available).
+
+        Encodes the memoized dict, so the REST list and the socket payload
+        can't drift apart.
+        """
+        return dumps_bytes(self.to_dict())
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Notification':
@@ -117,12 +190,12 @@ class Notification:
             experiment_id=data.get("experiment_id"),
             step_id=data.get("step_id"),
             metadata=data.get("metadata", {}),
-            delivery_methods=[DeliveryMethod(m) for m in data.get("delivery_methods", ["in_app"])]
+            delivery_methods=[DeliveryMethod(m) for m in data.get("delivery_methods", ["in_app"])],
+            created_at=datetime.fromisoformat(data["created_at"]),
         )
         
         # Set other properties
         notification.id = data["id"]
-        notification.created_at = datetime.fromisoformat(data["created_at"])
         notification.is_read = data.get("is_read", False)
         notification.is_dismissed = data.get("is_dismissed", False)
         
@@ -144,21 +217,30 @@ class NotificationService:
 
     The legacy ``create_notification`` method name is kept for compatibility
     with `main.py`. Internally it delegates to ``add_notification``.
+
+    Inside a ``batch()`` block, notifications are committed once and emitted
+    once per user when the block exits: a lone notification still goes out
+    as a ``notification`` event, several as one ``notifications`` event
+    carrying a list.
     """
 
     def __init__(self, socketio=None):
         self.socketio = socketio
+        # Per-thread batch state: ``pending`` is a {username: [dict, ...]}
+        # while a ``batch()`` block is open on this thread, else absent.
+        self._local = threading.local()
 
-        # Register notification handlers for different step types
+        # Register notification handlers for different step types. Bound
+        # once here; add_notification does a single ``get`` per dispatch.
         self.notification_handlers = {
             NotificationType.STEP_READY: self._handle_step_ready,
-            NotificationType.STEP_COMPLETED: self._handle_step_completed,
             NotificationType.STEP_PAUSED: self._handle_step_paused,
             NotificationType.STEP_TIMEOUT: self._handle_step_timeout,
             NotificationType.RESOURCE_CONFLICT: self._handle_resource_conflict,
             NotificationType.USER_ATTENTION_REQUIRED: self._handle_user_attention_required,
             NotificationType.ERROR: self._handle_error,
-            # GENERAL_INFO and CUSTOM don't need special handling
+            # STEP_COMPLETED, GENERAL_INFO and CUSTOM don't need special
+            # handling; leaving them out skips a no-op call.
         }
 
     # ------------------------------------------------------------------
@@ -176,9 +258,9 @@ class NotificationService:
             step_id=orm.step_id,
             metadata=dict(orm.notification_metadata or {}),
             delivery_methods=[DeliveryMethod(m) for m in (orm.delivery_methods or ['in_app'])],
+            created_at=orm.created_at,
         )
         n.id = orm.id
-        n.created_at = orm.created_at
         n.is_read = orm.is_read
         n.is_dismissed = orm.is_dismissed
         for action_data in (orm.actions or []):
@@ -228,24 +310,88 @@ class NotificationService:
         from models import NotificationORM
 
         # Run type-specific handler first (may mutate notification.actions etc.)
-        if notification.type in self.notification_handlers:
-            self.notification_handlers[notification.type](notification)
+        handler = self.notification_handlers.get(notification.type)
+        if handler is not None:
+            handler(notification)
 
         rows = self._notification_to_orm_rows(notification)
         for row in rows:
             db.session.add(row)
-        db.session.commit()
 
-        if self.socketio:
+        pending = getattr(self._local, 'pending', None)
+        if pending is not None:
+            # Batched: commit + emit happen once in ``batch()``.
+            payload = notification.to_dict()
             for user in notification.target_users:
-                self.socketio.emit(
-                    'notification',
-                    notification.to_dict(),
-                    room=f'user_{user}'
-                )
+                pending.setdefault(user, []).append(payload)
+            return notification.id
+
+        db.session.commit()
+
+        if self.socketio and notification.target_users:
+            # One emit addressed to every target's room: the packet is
+            # encoded once, however many users it goes to.
+            self.socketio.emit(
+                'notification',
+                notification.to_dict(),
+                room=self._rooms(notification.target_users),
+            )
 
         return notification.id
 
+    @staticmethod
+    def _rooms(users) -> Any:
+        """Socket.IO ``room`` argument addressing each of ``users``."""
+        rooms = [f'user_{user}' for user in users]
+        return rooms[0] if len(rooms) == 1 else rooms
+
+    @contextmanager
+    def batch(self):
+        """Coalesce the notifications added in this block.
+
+        On normal exit the session is committed once and each user gets a
+        single socket emit. Re-entrant: a nested block joins the outer one.
+
+        If the block raises, nothing is emitted and this method commits
+        nothing; the exception propagates with the rows still in the session
+        for the caller to roll back. Rows are not guaranteed to be
+        uncommitted, though: anything inside the block that commits the
+        session (e.g. a scheduler handler persisting a step) commits them
+        too.
+        """
+        if getattr(self._local, 'pending', None) is not None:
+            yield
+            return
+        pending: Dict[str, List[Dict[str, Any]]] = {}
+        self._local.pending = pending
+        try:
+            yield
+        except BaseException:
+            del self._local.pending
+            raise
+        del self._local.pending
+        if not pending:
+            return
+        db.session.commit()
+        if self.socketio:
+            self._emit_pending(pending)
+
+    def _emit_pending(self, pending: Dict[str, List[Dict[str, Any]]]) -> None:
+        """Emit a closed batch: one event per distinct payload list.
+
+        Users who were sent exactly the same notifications (the usual case
+        for a multi-target notification) share one multi-room emit.
+        """
+        groups: Dict[tuple, List[str]] = {}
+        for user, payloads in pending.items():
+            groups.setdefault(tuple(map(id, payloads)), []).append(user)
+        for users in groups.values():
+            payloads = pending[users[0]]
+            if len(payloads) == 1:
+                self.socketio.emit('notification', payloads[0], room=self._rooms(users))
+            else:
+                self.socketio.emit('notifications', payloads, room=self._rooms(users))
+
     # Legacy alias used by main.py and the notification factories.
     def create_notification(self, notification: Notification) -> str:
         return self.add_notification(notification)
@@ -260,38 +406,35 @@ class NotificationService:
         rows = q.order_by(NotificationORM.created_at.desc()).all()
         return [self._orm_to_notification(r) for r in rows]
 
+    # mark/dismiss/delete are single UPDATE/DELETE statements: no rows are
+    # loaded into the session, so the write transaction (and SQLite's
+    # database lock) is held only for the statement itself.
     def mark_as_read(self, notification_id: str) -> bool:
-        from models import NotificationORM
-
-        rows = NotificationORM.query.filter_by(id=notification_id).all()
-        if not rows:
-            return False
-        for r in rows:
-            r.is_read = True
-        db.session.commit()
-        return True
+        return self._update_flag(notification_id, is_read=True)
 
     def mark_as_dismissed(self, notification_id: str) -> bool:
+        return self._update_flag(notification_id, is_dismissed=True)
+
+    def delete_notification(self, notification_id: str) -> bool:
         from models import NotificationORM
 
-        rows = NotificationORM.query.filter_by(id=notification_id).all()
-        if not rows:
-            return False
-        for r in rows:
-            r.is_dismissed = True
+        count = (
+            NotificationORM.query.filter_by(id=notification_id)
+            .delete(synchronize_session=False)
+        )
         db.session.commit()
-        return True
+        return count > 0
 
-    def delete_notification(self, notification_id: str) -> bool:
+    @staticmethod
+    def _update_flag(notification_id: str, **values: bool) -> bool:
         from models import NotificationORM
 
-        rows = NotificationORM.query.filter_by(id=notification_id).all()
-        if not rows:
-            return False
-        for r in rows:
-            db.session.delete(r)
+        count = (
+            NotificationORM.query.filter_by(id=notification_id)
+            .update(values, synchronize_session=False)
+        )
         db.session.commit()
-        return True
+        return count > 0
     
     # --- Notification Type Handlers ---
     
@@ -300,41 +443,21 @@ class NotificationService:
         # Add start action
         if notification.step_id:
             notification.actions.append(
-                NotificationAction(
-                    action_id="start_step",
-                    action_type=ActionType.BUTTON,
-                    label="Start Step",
-                    data={"step_id": notification.step_id}
-                )
+                _START_STEP_ACTION.with_data({"step_id": notification.step_id})
             )
     
-    def _handle_step_completed(self, notification: Notification):
-        """Handle STEP_COMPLETED notifications"""
-        # No special handling needed
-        pass
-    
     def _handle_step_paused(self, notification: Notification):
         """Handle STEP_PAUSED notifications"""
         if notification.step_id:
             notification.actions.append(
-                NotificationAction(
-                    action_id="resume_step",
-                    action_type=ActionType.BUTTON,
-                    label="Resume Step",
-                    data={"step_id": notification.step_id}
-                )
+                _RESUME_STEP_ACTION.with_data({"step_id": notification.step_id})
             )
     
     def _handle_step_timeout(self, notification: Notification):
         """Handle STEP_TIMEOUT notifications"""
         if notification.step_id:
             notification.actions.append(
-                NotificationAction(
-                    action_id="complete_step",
-                    action_type=ActionType.BUTTON,
-                    label="Mark as Complete",
-                    data={"step_id": notification.step_id}
-                )
+                _COMPLETE_STEP_ACTION.with_data({"step_id": notification.step_id})
             )
     
     def _handle_resource_conflict(self, notification: Notification):
@@ -342,29 +465,18 @@ class NotificationService:
         # Add actions for conflict resolution
         if notification.step_id and notification.metadata.get("conflicting_step_id"):
             notification.actions.extend([
-                NotificationAction(
-                    action_id="pause_step",
-                    action_type=ActionType.BUTTON,
-                    label="Pause Current Step",
-                    data={"step_id": notification.step_id}
+                _PAUSE_STEP_ACTION.with_data({"step_id": notification.step_id}),
+                _PAUSE_CONFLICTING_ACTION.with_data(
+                    {"step_id": notification.metadata["conflicting_step_id"]}
                 ),
-                NotificationAction(
-                    action_id="pause_conflicting_step",
-                    action_type=ActionType.BUTTON,
-                    label="Pause Conflicting Step",
-                    data={"step_id": notification.metadata["conflicting_step_id"]}
-                )
             ])
     
     def _handle_user_attention_required(self, notification: Notification):
         """Handle USER_ATTENTION_REQUIRED notifications"""
         if notification.step_id:
             notification.actions.append(
-                NotificationAction(
-                    action_id="view_step",
-                    action_type=ActionType.LINK,
-                    label="View Step",
-                    data={"link": f"/run/{notification.experiment_id}?focus={notification.step_id}"}
+                _VIEW_STEP_ACTION.with_data(
+                    {"link": f"/run/{notification.experiment_id}?focus={notification.step_id}"}
                 )
             )
     
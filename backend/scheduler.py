@@ -1,5 +1,12 @@
+import functools
+import heapq
+import logging
+import threading
+from collections import defaultdict, deque
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Tuple
+from operator import itemgetter
+from typing import DefaultDict, Deque, Iterable, List, Dict, Optional, Set, Tuple
 
 from db import db
 from models import (
@@ -11,12 +18,27 @@ from models import (
     StepORM,
 )
 
+logger = logging.getLogger(__name__)
+
+# Heaps smaller than this are never compacted; below it a rebuild costs more
+# than the stale entries it would drop.
+_HEAP_COMPACT_MIN = 64
+
 
 class ScheduleConflictError(Exception):
     """Custom exception for scheduling conflicts."""
     pass
 
 
+def _synchronized(method):
+    """Run ``method`` while holding the scheduler's re-entrant lock."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
 class Scheduler:
     """In-memory scheduler backed by SQLAlchemy persistence.
 
@@ -27,12 +49,67 @@ class Scheduler:
     On first access (or after ``hydrate_from_db()``) the cache is populated
     from ``ExperimentORM``. Tests can call ``hydrate_from_db`` inside a fresh
     app context to simulate a restart.
+
+    Every method that mutates the cache runs under ``self._lock`` (an
+    ``RLock``, since e.g. ``calculate_initial_schedule`` calls
+    ``update_ready_status``), so concurrent request threads can't interleave
+    half-applied updates.
     """
 
+    __slots__ = (
+        "_experiments",
+        "_schedule",
+        "_step_to_experiment",
+        "_dirty_experiments",
+        "_ready_queue",
+        "_dependents",
+        "_start_heap",
+        "_running_heap",
+        "_start_keys",
+        "_running_keys",
+        "_hydrated",
+        "_lock",
+    )
+
     def __init__(self):
         self._experiments: Dict[str, Experiment] = {}
         self._schedule: Dict[str, Step] = {}
+        # step_id -> experiment_id reverse index, maintained alongside
+        # ``_schedule`` so step routes don't scan every experiment.
+        self._step_to_experiment: Dict[str, str] = {}
+        # Experiments whose steps changed since they were last planned.
+        # ``calculate_initial_schedule(only=...)`` skips clean experiments.
+        self._dirty_experiments: Set[str] = set()
+        # Step IDs in the order they became READY. Entries go stale once a
+        # step leaves READY (or is removed); ``next_ready_step`` drops them
+        # lazily, so no transition has to search the queue.
+        self._ready_queue: Deque[str] = deque()
+        # dep_id -> IDs of the steps that depend on it, built lazily by
+        # ``_build_reverse_deps`` and dropped whenever edges may have moved.
+        self._dependents: Optional[Dict[str, List[str]]] = None
+        # Min-heaps of (start, step_id) for PENDING/READY steps and
+        # (expected_end, step_id) for RUNNING ones, feeding
+        # ``get_upcoming_steps``. Entries are pushed whenever a key is set
+        # and never updated in place: a popped entry whose key no longer
+        # matches its step is stale and dropped. ``_start_keys`` /
+        # ``_running_keys`` map each step to its live key; once stale
+        # entries outnumber live ones the heap is rebuilt from the map.
+        self._start_heap: List[Tuple[datetime, str]] = []
+        self._running_heap: List[Tuple[datetime, str]] = []
+        self._start_keys: Dict[str, datetime] = {}
+        self._running_keys: Dict[str, datetime] = {}
         self._hydrated = False
+        self._lock = threading.RLock()
+
+    @contextmanager
+    def locked(self):
+        """Hold the scheduler lock across several calls.
+
+        For callers that apply a sequence of transitions and need no other
+        thread to interleave between them (e.g. the batch events route).
+        """
+        with self._lock:
+            yield self
 
     # ------------------------------------------------------------------
     # Cache-as-a-property accessors. Routes use scheduler.experiments today;
@@ -58,24 +135,64 @@ class Scheduler:
                 pass
         return self._schedule
 
+    @property
+    def all_steps(self) -> Dict[str, Step]:
+        """Flat ``step_id -> Step`` index across every experiment.
+
+        This is the same dict as ``schedule``; it is maintained incrementally
+        by add/upsert/remove, so lookups never walk ``experiment.steps``.
+        """
+        return self.schedule
+
+    @property
+    def step_to_experiment(self) -> Dict[str, str]:
+        if not self._hydrated:
+            try:
+                self.hydrate_from_db()
+            except RuntimeError:
+                pass
+        return self._step_to_experiment
+
     # ------------------------------------------------------------------
     # Persistence helpers
     # ------------------------------------------------------------------
+    @_synchronized
     def hydrate_from_db(self) -> None:
         """Reload the in-memory cache from ExperimentORM."""
         self._experiments = {}
         self._schedule = {}
+        self._step_to_experiment = {}
+        self._dirty_experiments = set()
+        self._ready_queue = deque()
+        self._dependents = None
+        self._start_heap = []
+        self._running_heap = []
+        self._start_keys = {}
+        self._running_keys = {}
         for exp_orm in ExperimentORM.query.all():
             exp_dc = exp_orm.to_dataclass()
             self._experiments[exp_dc.id] = exp_dc
             for step_id, step_dc in exp_dc.steps.items():
                 self._schedule[step_id] = step_dc
+                self._step_to_experiment[step_id] = exp_dc.id
+                if step_dc.status is StepStatus.READY:
+                    self._ready_queue.append(step_id)
+                self._push_timing(step_dc)
         self._hydrated = True
 
+    @_synchronized
     def reset_cache(self) -> None:
         """Drop the cache; next access rehydrates. Test helper."""
         self._experiments = {}
         self._schedule = {}
+        self._step_to_experiment = {}
+        self._dirty_experiments = set()
+        self._ready_queue = deque()
+        self._dependents = None
+        self._start_heap = []
+        self._running_heap = []
+        self._start_keys = {}
+        self._running_keys = {}
         self._hydrated = False
 
     def _persist_experiment(self, experiment: Experiment) -> None:
@@ -113,67 +230,141 @@ class Scheduler:
     # ------------------------------------------------------------------
     # Mutations
     # ------------------------------------------------------------------
+    @_synchronized
     def add_experiment(self, experiment: Experiment):
         """Adds an experiment + its steps. Persists to DB and updates cache."""
         if experiment.id in self.experiments:
-            print(f"Warning: Experiment '{experiment.name}' (ID: {experiment.id}) already added.")
+            logger.warning("Experiment '%s' (ID: %s) already added.", experiment.name, experiment.id)
             return
         self._persist_experiment(experiment)
         self._experiments[experiment.id] = experiment
-        for step_id, step in experiment.steps.items():
-            self._schedule[step_id] = step
-        print(f"Experiment '{experiment.name}' added to scheduler.")
-
+        steps = experiment.steps
+        clashing = self._schedule.keys() & steps.keys()
+        if clashing:
+            logger.warning(
+                "Experiment '%s' reuses %d step ID(s) already in the schedule; "
+                "they now point at its steps.",
+                experiment.name, len(clashing),
+            )
+        self._schedule.update(steps)
+        self._step_to_experiment.update(dict.fromkeys(steps, experiment.id))
+        self._ready_queue.extend(
+            step_id for step_id, step in steps.items() if step.status is StepStatus.READY
+        )
+        dependents = self._dependents
+        if clashing:
+            self._dependents = None
+        elif dependents is not None:
+            # New steps only add edges; extend the index rather than drop it.
+            for step_id, step in steps.items():
+                for dep_id in step.dependencies:
+                    dependents.setdefault(dep_id, []).append(step_id)
+        for step in steps.values():
+            self._push_timing(step)
+        self._dirty_experiments.add(experiment.id)
+        logger.debug("Experiment '%s' added to scheduler.", experiment.name)
+
+    @_synchronized
     def upsert_experiment_steps(
         self,
         experiment: Experiment,
         incoming_steps: List[Step],
-    ) -> None:
+    ) -> bool:
         """Reconcile ``experiment.steps`` against ``incoming_steps`` by ID.
 
         Existing steps with a matching ID keep their runtime state (status,
         actual_start_time, elapsed_time) -- only editable fields (name,
-        duration, type, notes, resource, dependencies) are updated.
+        duration, type, notes, resource, dependencies) are updated, and only
+        when they differ, so an unchanged step keeps its serializer cache.
 
         Steps in the incoming list that aren't currently on the experiment
         are added. Steps on the experiment that aren't in the incoming list
         are removed.
 
+        The experiment is flagged for re-planning (and its topological order
+        dropped) only when something that affects the schedule changed; a
+        payload identical to the current state is a no-op, DB included.
+        Returns whether anything changed.
+
         This is the fix for the audit's wipe-and-recreate bug in PUT.
         """
         incoming_by_id = {s.id: s for s in incoming_steps if s.id}
         existing_ids = set(experiment.steps.keys())
+        changed = False
+        # Duration/type/resource/dependency edits, adds and removes move
+        # the plan; name/notes edits only touch the serialized output.
+        replan = False
 
         # Remove orphans first.
         for old_id in list(existing_ids - set(incoming_by_id.keys())):
             old_step = experiment.steps.pop(old_id, None)
             if old_step is not None:
                 self._schedule.pop(old_id, None)
+                self._step_to_experiment.pop(old_id, None)
+                self._start_keys.pop(old_id, None)
+                self._running_keys.pop(old_id, None)
+                changed = replan = True
 
         # Apply edits + adds. Incoming step instances may carry a `.id`
         # generated client-side; we treat that as the dedup key.
         for inc in incoming_steps:
-            if inc.id in experiment.steps:
-                target = experiment.steps[inc.id]
-                # Preserve runtime state -- only copy editable fields.
+            target = experiment.steps.get(inc.id)
+            if target is None:
+                experiment.steps[inc.id] = inc
+                self._schedule[inc.id] = inc
+                self._step_to_experiment[inc.id] = experiment.id
+                self._push_timing(inc)
+                changed = replan = True
+                continue
+
+            # Preserve runtime state -- only copy editable fields that differ.
+            step_changed = False
+            if target.name != inc.name:
                 target.name = inc.name
-                target.duration = inc.duration
-                target.step_type = inc.step_type
-                target.dependencies = list(inc.dependencies)
+                step_changed = True
+            if target.notes != inc.notes:
                 target.notes = inc.notes
+                step_changed = True
+            if target.step_type is not inc.step_type:
+                target.step_type = inc.step_type
+                step_changed = replan = True
+            if target.resource_needed != inc.resource_needed:
                 target.resource_needed = inc.resource_needed
+                step_changed = replan = True
+            if target.dependencies != inc.dependencies:
+                target.dependencies = list(inc.dependencies)
+                step_changed = replan = True
+            if target.duration != inc.duration:
+                target.duration = inc.duration
                 # Re-derive scheduled_end_time if a scheduled_start exists.
                 if target.scheduled_start_time:
                     target.scheduled_end_time = target.scheduled_start_time + target.duration
-            else:
-                experiment.steps[inc.id] = inc
-                self._schedule[inc.id] = inc
+                step_changed = replan = True
+            if step_changed:
+                target.mark_edited()
+                # A duration edit moves a running step's expected end; re-key
+                # its heap entry so get_upcoming_steps doesn't lose it.
+                self._push_timing(target)
+                changed = True
+
+        if not changed:
+            return False
+
+        experiment.mark_dirty()
+        if replan:
+            # Dependencies may have been rewired; drop the cached topo order
+            # and flag the experiment for re-planning.
+            self.invalidate_topology(experiment.id)
+            self._dependents = None
+            self._dirty_experiments.add(experiment.id)
 
         # Persist the whole experiment back to DB. We rebuild the row but
         # the dataclass now carries preserved runtime state for surviving
         # steps, so the new ORM rows reflect that state.
         self._persist_experiment(experiment)
+        return True
 
+    @_synchronized
     def remove_experiment(self, experiment_id: str) -> bool:
         """Delete an experiment and cascade to its steps."""
         orm = db.session.get(ExperimentORM, experiment_id)
@@ -186,104 +377,301 @@ class Scheduler:
         if exp is not None:
             for sid in list(exp.steps.keys()):
                 self._schedule.pop(sid, None)
+                self._step_to_experiment.pop(sid, None)
+                self._start_keys.pop(sid, None)
+                self._running_keys.pop(sid, None)
+            self._dependents = None
+            self._compact_heaps(force=True)
+        self._dirty_experiments.discard(experiment_id)
         return True
 
     def get_step(self, step_id: str) -> Optional[Step]:
         """Retrieve a step by its ID from the schedule."""
         return self.schedule.get(step_id)
 
-    def _resolve_dependencies(self, step: Step) -> Optional[datetime]:
-        """Find the earliest time a step can start based on its dependencies."""
-        earliest_start = None
-        for dep_id in step.dependencies:
-            dep_step = self.get_step(dep_id)
-            if not dep_step:
-                print(f"Error: Dependency step ID {dep_id} not found for step '{step.name}'.")
-                return None
+    @_synchronized
+    def next_ready_step(self) -> Optional[Step]:
+        """Return the longest-READY step, if any, without a full scan.
 
-            dep_end_time = dep_step.actual_end_time or dep_step.scheduled_end_time
+        Steps enter the ready queue as ``update_ready_status`` releases them
+        (in topological order during planning). Entries whose step has since
+        started, been skipped, or been removed are discarded here.
+        """
+        queue = self._ready_queue
+        schedule = self.all_steps
+        while queue:
+            step = schedule.get(queue[0])
+            if step is not None and step.status is StepStatus.READY:
+                return step
+            queue.popleft()
+        return None
+
+    def get_experiment_for_step(self, step_id: str) -> Optional[Experiment]:
+        """Return the experiment owning ``step_id`` via the reverse index."""
+        experiment_id = self.step_to_experiment.get(step_id)
+        if experiment_id is None:
+            return None
+        return self._experiments.get(experiment_id)
+
+    def _resolve_dependencies(
+        self,
+        step: Step,
+        dep_end_cache: Optional[Dict[str, datetime]] = None,
+    ) -> Optional[datetime]:
+        """Find the earliest time a step can start based on its dependencies.
 
-            if not dep_end_time:
-                 print(f"Warning: Dependency '{dep_step.name}' for step '{step.name}' has no end time.")
-                 return None
+        ``dep_end_cache`` maps step IDs already planned in the current pass to
+        their end times, so those dependencies skip the schedule lookup.
+        """
+        dep_ends = self._dependency_end_times(step, dep_end_cache)
+        if dep_ends is None:
+            return None
+        return max(dep_ends, default=None)
 
-            if earliest_start is None or dep_end_time > earliest_start:
-                earliest_start = dep_end_time
+    def _dependency_end_times(
+        self,
+        step: Step,
+        dep_end_cache: Optional[Dict[str, datetime]] = None,
+    ) -> Optional[List[datetime]]:
+        """End times of ``step``'s dependencies, or None if any is unresolved.
 
-        return earliest_start
+        A dependency is unresolved if it isn't in the schedule or has neither
+        an actual nor a scheduled end time yet.
+        """
+        cache = dep_end_cache or {}
+        dep_ends: List[datetime] = []
+        for dep_id in step.dependencies:
+            dep_end_time = cache.get(dep_id)
+            if dep_end_time is None:
+                dep_step = self.get_step(dep_id)
+                if not dep_step:
+                    logger.error("Dependency step ID %s not found for step '%s'.", dep_id, step.name)
+                    return None
+                dep_end_time = dep_step.actual_end_time or dep_step.scheduled_end_time
+                if not dep_end_time:
+                    logger.warning(
+                        "Dependency '%s' for step '%s' has no end time.", dep_step.name, step.name
+                    )
+                    return None
+            dep_ends.append(dep_end_time)
+        return dep_ends
+
+    def _build_reverse_deps(self) -> Dict[str, List[str]]:
+        """Return (and cache) the ``dep_id -> dependent step IDs`` map.
+
+        Inverts every cached step's ``dependencies`` once; add/upsert/remove
+        drop the cache, so between edits a completion finds its dependents
+        without walking the schedule.
+        """
+        if self._dependents is None:
+            dependents: Dict[str, List[str]] = {}
+            for step_id, step in self.schedule.items():
+                for dep_id in step.dependencies:
+                    dependents.setdefault(dep_id, []).append(step_id)
+            self._dependents = dependents
+        return self._dependents
+
+    def _dependent_steps(self, step_id: str) -> List[Step]:
+        """The cached steps that list ``step_id`` as a dependency."""
+        schedule = self.schedule
+        return [
+            schedule[child_id]
+            for child_id in self._build_reverse_deps().get(step_id, ())
+            if child_id in schedule
+        ]
 
-    def calculate_initial_schedule(self, start_time: Optional[datetime] = None):
-        """Calculates the initial scheduled start/end times for all PENDING steps."""
-        base_time = start_time or datetime.now()
-        processed_steps = set()
-        steps_to_process = list(self.schedule.values())
+    @staticmethod
+    def _start_key(step: Step) -> Optional[datetime]:
+        """The time ``get_upcoming_steps`` windows a PENDING/READY step on."""
+        return step.scheduled_start_time or step.earliest_possible_start_time
 
-        MAX_ITERATIONS = len(steps_to_process) * 2
-        iterations = 0
-        while steps_to_process and iterations < MAX_ITERATIONS:
-            iterations += 1
-            step = steps_to_process.pop(0)
+    def _push_timing(self, step: Step) -> None:
+        """Queue ``step`` on the heap matching its status, if it has a key.
 
-            if step.id in processed_steps or step.status != StepStatus.PENDING:
-                continue
+        A step that has left both windowed states (paused, completed, ...)
+        is dropped from the live maps; its heap entries go stale.
+        """
+        status = step.status
+        if status is StepStatus.RUNNING:
+            key = step.get_expected_end_time()
+            heap, live, other = self._running_heap, self._running_keys, self._start_keys
+        elif status is StepStatus.PENDING or status is StepStatus.READY:
+            key = self._start_key(step)
+            heap, live, other = self._start_heap, self._start_keys, self._running_keys
+        else:
+            self._start_keys.pop(step.id, None)
+            self._running_keys.pop(step.id, None)
+            return
+        other.pop(step.id, None)
+        if key is None:
+            live.pop(step.id, None)
+            return
+        if live.get(step.id) == key:
+            return
+        live[step.id] = key
+        heapq.heappush(heap, (key, step.id))
+        if len(heap) > 2 * len(live) + _HEAP_COMPACT_MIN:
+            self._compact_heaps()
 
-            earliest_dep_start = self._resolve_dependencies(step)
-
-            can_schedule = False
-            if not step.dependencies:
-                step.scheduled_start_time = step.scheduled_start_time or base_time
-                can_schedule = True
-            elif earliest_dep_start:
-                step.scheduled_start_time = step.scheduled_start_time or earliest_dep_start
-                can_schedule = True
-            else:
-                steps_to_process.append(step)
+    def _compact_heaps(self, force: bool = False) -> None:
+        """Rebuild each heap from its live map once stale entries dominate.
+
+        Live-map entries whose step no longer matches (e.g. a status changed
+        outside the scheduler) are dropped too. ``force`` rebuilds
+        regardless, e.g. after removing an experiment's steps.
+        """
+        schedule = self._schedule
+        for attr, live, is_current in (
+            ("_start_heap", self._start_keys, self._is_current_start),
+            ("_running_heap", self._running_keys, self._is_current_running),
+        ):
+            if not force and len(getattr(self, attr)) <= 2 * len(live) + _HEAP_COMPACT_MIN:
                 continue
+            for step_id, key in list(live.items()):
+                step = schedule.get(step_id)
+                if step is None or not is_current(step, key):
+                    del live[step_id]
+            heap = [(key, step_id) for step_id, key in live.items()]
+            heapq.heapify(heap)
+            setattr(self, attr, heap)
+
+    def invalidate_topology(self, experiment_id: str) -> None:
+        """Drop the cached topological order for an experiment.
+
+        Call after anything that changes step membership or dependency
+        edges; the next ``calculate_initial_schedule`` recomputes it.
+        """
+        experiment = self._experiments.get(experiment_id)
+        if experiment is not None:
+            experiment._topo_order = None
 
-            if can_schedule:
-                 if step.scheduled_start_time:
-                    step.scheduled_end_time = step.scheduled_start_time + step.duration
-                    step.earliest_possible_start_time = earliest_dep_start or base_time
-                    print(f"Scheduled '{step.name}': {step.scheduled_start_time} -> {step.scheduled_end_time}")
-                    processed_steps.add(step.id)
-                 else:
-                     print(f"Error: Could not determine scheduled start for '{step.name}'.")
-                     steps_to_process.append(step)
+    @staticmethod
+    def _topological_order(experiment: Experiment) -> List[str]:
+        """The experiment's cached Kahn order (see ``Experiment.topo_order``)."""
+        return experiment.topo_order()
 
-        if iterations >= MAX_ITERATIONS and steps_to_process:
-            print("Warning: Max scheduling iterations reached. Possible circular dependency or issue?")
+    @_synchronized
+    def calculate_initial_schedule(
+        self,
+        start_time: Optional[datetime] = None,
+        only: Optional[str] = None,
+    ):
+        """Calculates the initial scheduled start/end times for PENDING steps.
+
+        Walks each experiment's cached topological order, so every step's
+        dependencies are scheduled before it is visited and a single pass
+        suffices.
+
+        With ``only=<experiment_id>`` just that experiment is re-planned (and
+        nothing happens if it hasn't changed since it was last planned);
+        other experiments' scheduled times, READY flags and DB rows are left
+        untouched. Without it every experiment is planned.
+        """
+        base_time = start_time or datetime.now()
+
+        if only is None:
+            experiments = list(self.experiments.values())
+        elif only in self._dirty_experiments and only in self.experiments:
+            experiments = [self._experiments[only]]
+        else:
+            return
 
-        self.update_ready_status()
+        # End times of steps planned in this pass, for their dependents.
+        dep_end_cache: Dict[str, datetime] = {}
+        for experiment in experiments:
+            order = self._topological_order(experiment)
+            if len(order) < len(experiment.steps):
+                ordered = set(order)
+                cyclic = [s.name for sid, s in experiment.steps.items() if sid not in ordered]
+                logger.warning(
+                    "Circular dependency in experiment '%s'; %d step(s) left unscheduled: %s.",
+                    experiment.name, len(cyclic), ", ".join(cyclic),
+                )
+
+            for step_id in order:
+                step = experiment.steps[step_id]
+                if step.status is not StepStatus.PENDING:
+                    continue
+
+                earliest_dep_start = self._resolve_dependencies(step, dep_end_cache)
+                if step.dependencies and not earliest_dep_start:
+                    # Missing dependency or one without an end time yet.
+                    continue
+
+                step.scheduled_start_time = (
+                    step.scheduled_start_time or earliest_dep_start or base_time
+                )
+                step.scheduled_end_time = step.scheduled_start_time + step.duration
+                dep_end_cache[step_id] = step.scheduled_end_time
+                step.earliest_possible_start_time = earliest_dep_start or base_time
+                step.mark_dirty()
+                self._push_timing(step)
+                logger.debug(
+                    "Scheduled '%s': %s -> %s",
+                    step.name, step.scheduled_start_time, step.scheduled_end_time,
+                )
+
+        planned_steps = [s for exp in experiments for s in exp.steps.values()]
+        for experiment in experiments:
+            self._dirty_experiments.discard(experiment.id)
+
+        self.update_ready_status(planned_steps)
 
         # Persist mutated step state back to DB.
         try:
-            for step in self._schedule.values():
+            for step in planned_steps:
                 self._persist_step_state(step)
         except RuntimeError:
             # Out of app context; tests that don't need persistence skip this.
             pass
 
-    def update_ready_status(self):
-         """Updates steps status to READY if dependencies are met and they are PENDING."""
-         for step in self.schedule.values():
-             if step.status == StepStatus.PENDING:
-                 deps_met = True
-                 earliest_start_from_deps = None
-                 for dep_id in step.dependencies:
-                     dep_step = self.get_step(dep_id)
-                     if not dep_step or dep_step.status != StepStatus.COMPLETED:
-                         deps_met = False
-                         break
-                     if dep_step.actual_end_time:
-                         if earliest_start_from_deps is None or dep_step.actual_end_time > earliest_start_from_deps:
-                             earliest_start_from_deps = dep_step.actual_end_time
-
-                 if deps_met:
-                     step.status = StepStatus.READY
-                     step.earliest_possible_start_time = (
-                         earliest_start_from_deps or step.earliest_possible_start_time
-                     )
-                     print(f"Step '{step.name}' is now READY.")
+    @_synchronized
+    def update_ready_status(self, steps: Optional[Iterable[Step]] = None) -> List[Step]:
+        """Updates steps status to READY if dependencies are met and they are PENDING.
+
+        ``steps`` limits the sweep (defaults to the whole schedule). Returns
+        the steps released by this call, in sweep order.
+        """
+        pending = StepStatus.PENDING
+        completed = StepStatus.COMPLETED
+        schedule = self.schedule
+        get_dep = schedule.get
+        # Decide first, then flip every released step in one pass.
+        releasable: List[Tuple[Step, Optional[datetime]]] = []
+        for step in (schedule.values() if steps is None else steps):
+            if step.status is not pending:
+                continue
+            deps_met = True
+            earliest_start_from_deps = None
+            for dep_id in step.dependencies:
+                dep_step = get_dep(dep_id)
+                if dep_step is None or dep_step.status is not completed:
+                    deps_met = False
+                    break
+                dep_end = dep_step.actual_end_time
+                if dep_end and (earliest_start_from_deps is None or dep_end > earliest_start_from_deps):
+                    earliest_start_from_deps = dep_end
+            if deps_met:
+                releasable.append((step, earliest_start_from_deps))
+
+        if not releasable:
+            return []
+
+        ready = StepStatus.READY
+        released: List[Step] = []
+        for step, earliest_start_from_deps in releasable:
+            step.status = ready
+            if earliest_start_from_deps:
+                step.earliest_possible_start_time = earliest_start_from_deps
+            self._push_timing(step)
+            released.append(step)
+        self._ready_queue.extend(step.id for step in released)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "%d step(s) now READY: %s",
+                len(released), ", ".join(step.name for step in released),
+            )
+        return released
 
     @staticmethod
     def check_for_conflicts(experiment: Experiment) -> List[Dict[str, object]]:
@@ -296,10 +684,10 @@ class Scheduler:
 
         Algorithm:
 
-        1. Collect ``(step_id, step_name, resource, start, end)`` tuples for
-           every step where ``resource_needed`` is non-empty AND both
-           scheduled times are present.
-        2. Group by resource, sort each group by ``start``.
+        1. In one pass, group ``(step_id, step_name, resource, start, end)``
+           tuples by resource for every step where ``resource_needed`` is
+           non-empty AND both scheduled times are present.
+        2. Sort each group by ``start``.
         3. Walk pairwise within a group; emit a conflict for each pair whose
            half-open intervals overlap (``a.start < b.end and b.start < a.end``).
 
@@ -314,31 +702,31 @@ class Scheduler:
             stays small. The names are included so the frontend can render
             without re-resolving step IDs.
         """
-        # 1. Collect candidates. Skip anything missing a resource or a
-        #    scheduled window -- those can't participate in a real conflict.
-        candidates: List[Tuple[str, str, str, datetime, datetime]] = []
+        # 1. Collect candidates, grouped by resource. Skip anything missing a
+        #    resource or a scheduled window -- those can't participate in a
+        #    real conflict.
+        #    Windows are compared as the POSIX seconds Step keeps alongside
+        #    its datetimes, so overlap math is plain float arithmetic.
+        by_resource: DefaultDict[str, List[Tuple[str, str, str, float, float]]] = (
+            defaultdict(list)
+        )
         for step in experiment.steps.values():
             resource = step.resource_needed
             if not resource:  # None or empty string
                 continue
-            start = step.scheduled_start_time
-            end = step.scheduled_end_time
+            start = step._scheduled_start_ts
+            end = step._scheduled_end_ts
             if start is None or end is None:
                 continue
-            candidates.append((step.id, step.name, resource, start, end))
-
-        if not candidates:
-            return []
-
-        # 2. Group by resource.
-        by_resource: Dict[str, List[Tuple[str, str, str, datetime, datetime]]] = {}
-        for entry in candidates:
-            by_resource.setdefault(entry[2], []).append(entry)
+            by_resource[resource].append((step.id, step.name, resource, start, end))
 
         conflicts: List[Dict[str, object]] = []
 
-        # 3. Pairwise overlap check within each group.
+        # 2-3. Pairwise overlap check within each group; a single-entry
+        #      group can't conflict.
         for resource, entries in by_resource.items():
+            if len(entries) < 2:
+                continue
             entries.sort(key=lambda e: e[3])  # sort by start
             n = len(entries)
             for i in range(n):
@@ -354,7 +742,7 @@ class Scheduler:
                     if a_start < b_end and b_start < a_end:
                         overlap_start = max(a_start, b_start)
                         overlap_end = min(a_end, b_end)
-                        overlap_seconds = int((overlap_end - overlap_start).total_seconds())
+                        overlap_seconds = int(overlap_end - overlap_start)
                         # Zero-duration windows can't generate a real overlap;
                         # the half-open check above already filters those, but
                         # be defensive here against negative skew from clock math.
@@ -370,65 +758,153 @@ class Scheduler:
                         })
         return conflicts
 
-    def handle_step_start(self, step_id: str, start_time: Optional[datetime] = None):
-        """Handles the logic when a step starts."""
+    @_synchronized
+    def _release_and_persist(self, steps: Optional[Iterable[Step]] = None) -> List[Step]:
+        """Run the READY sweep and persist just the steps it released.
+
+        Only the released steps changed (status + earliest start), so there
+        is no need to rewrite every cached step's row. ``steps`` narrows the
+        sweep as in ``update_ready_status``.
+        """
+        released = self.update_ready_status(steps)
+        try:
+            for s in released:
+                self._persist_step_state(s)
+        except RuntimeError:
+            pass
+        return released
+
+    @_synchronized
+    def handle_step_start(self, step_id: str, start_time: Optional[datetime] = None) -> List[Step]:
+        """Handles the logic when a step starts.
+
+        Starting a step can't satisfy anyone's dependencies, so no READY
+        sweep runs; the empty list keeps the return shape uniform with the
+        other handlers.
+        """
         step = self.get_step(step_id)
         if step:
             actual_start = start_time or datetime.now()
             step.start(actual_start)
+            self._push_timing(step)
             self._persist_step_state(step)
-            self.update_ready_status()
-            try:
-                for s in self._schedule.values():
-                    self._persist_step_state(s)
-            except RuntimeError:
-                pass
-            print(f"Handling start for step '{step.name}'.")
-        else:
-            print(f"Error: Cannot handle start for unknown step ID {step_id}")
+            logger.debug("Handling start for step '%s'.", step.name)
+            return []
+        logger.warning("Cannot handle start for unknown step ID %s", step_id)
+        return []
+
+    @_synchronized
+    def handle_step_pause(self, step_id: str, now: Optional[datetime] = None) -> List[Step]:
+        """Handles the logic when a step is paused.
 
-    def handle_step_pause(self, step_id: str):
-        """Handles the logic when a step is paused."""
+        Pausing never releases anything; the empty list keeps the return
+        shape uniform with the other handlers.
+        """
         step = self.get_step(step_id)
         if step:
-            step.pause()
+            step.pause(now)
+            self._push_timing(step)
             self._persist_step_state(step)
-            print(f"Handling pause for step '{step.name}'.")
+            logger.debug("Handling pause for step '%s'.", step.name)
         else:
-            print(f"Error: Cannot handle pause for unknown step ID {step_id}")
+            logger.warning("Cannot handle pause for unknown step ID %s", step_id)
+        return []
+
+    @_synchronized
+    def handle_step_complete(self, step_id: str, end_time: Optional[datetime] = None) -> List[Step]:
+        """Handles the logic when a step completes. Returns newly READY steps.
 
-    def handle_step_complete(self, step_id: str, end_time: Optional[datetime] = None):
-        """Handles the logic when a step completes."""
+        The READY sweep covers just the completed step's dependents (via
+        ``_build_reverse_deps``) rather than the whole schedule.
+        """
         step = self.get_step(step_id)
         if step:
             actual_end = end_time or datetime.now()
             step.complete(actual_end)
+            self._push_timing(step)
             self._persist_step_state(step)
-            self.update_ready_status()
-            try:
-                for s in self._schedule.values():
-                    self._persist_step_state(s)
-            except RuntimeError:
-                pass
-            print(f"Handling completion for step '{step.name}'.")
-        else:
-            print(f"Error: Cannot handle completion for unknown step ID {step_id}")
+            # Only the direct dependents can have been unblocked.
+            released = self._release_and_persist(self._dependent_steps(step_id))
+            logger.debug("Handling completion for step '%s'.", step.name)
+            return released
+        logger.warning("Cannot handle completion for unknown step ID %s", step_id)
+        return []
+
+    @_synchronized
+    def handle_step_skip(self, step_id: str) -> List[Step]:
+        """Handles the logic when a step is skipped. Returns newly READY steps.
+
+        A skipped step unblocks its dependents just like a completed one, so
+        the READY sweep runs over its dependents here too.
+        """
+        step = self.get_step(step_id)
+        if step:
+            # Drive the transition through the dataclass so ``elapsed_time`` /
+            # ``actual_*`` stay coherent (a half-run step that gets skipped
+            # keeps the work it accumulated, but no end time).
+            step.update_status(StepStatus.SKIPPED)
+            self._push_timing(step)
+            self._persist_step_state(step)
+            released = self._release_and_persist(self._dependent_steps(step_id))
+            logger.debug("Handling skip for step '%s'.", step.name)
+            return released
+        logger.warning("Cannot handle skip for unknown step ID %s", step_id)
+        return []
 
+    @_synchronized
     def get_upcoming_steps(self, window: timedelta = timedelta(hours=1)) -> List[Step]:
-        """Returns steps that are scheduled or expected to start soon."""
+        """Returns steps that are scheduled or expected to start soon.
+
+        Only the in-window prefix of the start and running heaps is visited.
+        Entries keyed before ``now`` can never fall in a later window, so
+        they are discarded for good; in-window entries are pushed back.
+
+        Results are ordered by start time (``datetime.max`` if unknown).
+        Each step's sort key is worked out once as it is collected: a start
+        heap entry's key already is that time.
+        """
         now = datetime.now()
-        upcoming = []
-        for step in self.schedule.values():
-            if step.status in [StepStatus.READY, StepStatus.PENDING]:
-                start_time_to_check = step.scheduled_start_time or step.earliest_possible_start_time
-                if start_time_to_check and now <= start_time_to_check < now + window:
-                    upcoming.append(step)
-            elif step.status == StepStatus.RUNNING:
-                expected_end = step.get_expected_end_time()
-                if expected_end and now <= expected_end < now + window:
-                    upcoming.append(step)
-
-        return sorted(
-            upcoming,
-            key=lambda s: s.scheduled_start_time or s.earliest_possible_start_time or datetime.max,
+        horizon = now + window
+        schedule = self.schedule
+        upcoming: List[Tuple[datetime, Step]] = []
+        seen: Set[str] = set()
+
+        for heap, live, is_current, keyed_by_start in (
+            (self._start_heap, self._start_keys, self._is_current_start, True),
+            (self._running_heap, self._running_keys, self._is_current_running, False),
+        ):
+            keep: List[Tuple[datetime, str]] = []
+            while heap and heap[0][0] < horizon:
+                entry = heapq.heappop(heap)
+                key, step_id = entry
+                if step_id in seen:
+                    continue
+                step = schedule.get(step_id)
+                if key < now or step is None or not is_current(step, key):
+                    if live.get(step_id) == key:
+                        del live[step_id]
+                    continue
+                seen.add(step_id)
+                keep.append(entry)
+                if keyed_by_start:
+                    upcoming.append((key, step))
+                else:
+                    upcoming.append((self._start_key(step) or datetime.max, step))
+            for entry in keep:
+                heapq.heappush(heap, entry)
+
+        # Start-heap entries arrive in order, so this mostly merges in the
+        # running steps.
+        upcoming.sort(key=itemgetter(0))
+        return [step for _, step in upcoming]
+
+    @classmethod
+    def _is_current_start(cls, step: Step, key: datetime) -> bool:
+        return (
+            (step.status is StepStatus.PENDING or step.status is StepStatus.READY)
+            and cls._start_key(step) == key
         )
+
+    @staticmethod
+    def _is_current_running(step: Step, key: datetime) -> bool:
+        return step.status is StepStatus.RUNNING and step.get_expected_end_time() == key
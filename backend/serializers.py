@@ -15,67 +15,210 @@ Two notable shape decisions:
   ORM column name. The frontend Runner derives a per-tick elapsed value from
   ``actual_start_time`` for sub-second responsiveness; this server-snapshot
   field is used for resumed-from-pause math and history display.
+
+Serialized dicts are cached on the dataclasses (``_cached_dict``) and only
+rebuilt when the owning object's ``_dirty`` flag is set. Every mutation path
+(``Step.start``/``pause``/``complete``/``update_status``, the scheduler's
+time assignments, ``Experiment.add_step``, PUT/share routes) flips the flag,
+so a GET on an unchanged experiment costs a flag scan instead of a rebuild.
+
+Time fields default to ISO-8601 strings. Callers may pass ``epoch=True``
+(the read routes do for ``?format=epoch``) to get float Unix seconds
+instead -- one C call per field and a smaller payload. Each format has its
+own cache slot; a dirty flag drops both.
+
+``experiment_to_json`` goes one step further and caches the encoded bytes,
+so read routes can write an unchanged experiment without re-encoding it.
+Each time the caches are dropped ``experiment.version`` is bumped.
+
+Time fields are formatted here rather than left as ``datetime`` for the
+JSON provider: the same dicts go out over Flask-SocketIO (stdlib ``json``)
+and through Flask's default provider when orjson isn't installed, and the
+latter would render datetimes as RFC 822 strings. Since formatting happens
+once per change (the result is cached), orjson's native datetime encoding
+would save nothing on the GET path anyway.
 """
 from __future__ import annotations
 
+import json
 from typing import Any, Dict, List, Optional
 
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # Optional speedup; stdlib json via Flask otherwise.
+    orjson = None
+
 
-def step_to_dict(step) -> Dict[str, Any]:
+def step_to_dict(step, epoch: bool = False) -> Dict[str, Any]:
     """Serialize a single ``Step`` dataclass to its on-the-wire dict shape.
 
     All keys are snake_case. Optional time fields are only included when the
     underlying value is not ``None`` so the frontend can distinguish "never
     happened" from "happened at epoch zero" without a sentinel.
+
+    The returned dict is cached on the step until it is marked dirty; treat
+    it as read-only. A dirty step is rendered fresh but not cached, and its
+    flag is left for ``_refresh_experiment_cache`` to consume, so the owning
+    experiment still sees the change (and bumps its ``version``).
     """
-    out: Dict[str, Any] = {
-        "id": step.id,
-        "name": step.name,
-        "step_type": step.step_type.value,
-        # ``duration_seconds`` is a float -- the source of truth is
-        # ``timedelta.total_seconds()``. See module docstring for why we
-        # don't floor-divide by 60 here.
-        "duration_seconds": step.duration.total_seconds() if step.duration else 0.0,
-        "status": step.status.value,
-        "dependencies": list(step.dependencies or []),
-        "notes": step.notes,
-        # ``resource_required`` aligns the wire-name with the ORM column
-        # (``resource_needed`` -- see backend/models.py:357). The dataclass
-        # attribute is named ``resource_needed`` for legacy reasons; the wire
-        # name is what U8 normalizes.
-        "resource_required": step.resource_needed,
-    }
+    dirty = step._dirty
+    if not dirty:
+        cached = step._cached_epoch_dict if epoch else step._cached_dict
+        if cached is not None:
+            return cached
+
+    # Edit-only fields come from a skeleton kept across state transitions
+    # (dropped by ``Step.mark_edited`` and the duration/type setters).
+    static = step._static_dict
+    if static is None:
+        static = step._static_dict = {
+            "id": step.id,
+            "name": step.name,
+            "step_type": step._type_value,
+            # ``duration_seconds`` is a float -- ``timedelta.total_seconds()``
+            # cached on the step when ``duration`` is assigned. See module
+            # docstring for why we don't floor-divide by 60 here.
+            "duration_seconds": step._duration_seconds,
+            "dependencies": list(step.dependencies or []),
+            "notes": step.notes,
+            # ``resource_required`` aligns the wire-name with the ORM column
+            # (``resource_needed`` -- see backend/models.py:357). The
+            # dataclass attribute is named ``resource_needed`` for legacy
+            # reasons; the wire name is what U8 normalizes.
+            "resource_required": step.resource_needed,
+        }
+    out: Dict[str, Any] = dict(static)
+    out["status"] = step._status_value
 
-    if step.scheduled_start_time:
-        out["scheduled_start_time"] = step.scheduled_start_time.isoformat()
-    if step.scheduled_end_time:
-        out["scheduled_end_time"] = step.scheduled_end_time.isoformat()
-    if step.actual_start_time:
-        out["actual_start_time"] = step.actual_start_time.isoformat()
+    # The time fields are properties on Step; read their backing slots
+    # directly so each field costs a slot load instead of a getter call.
+    # Epoch output uses the POSIX seconds the setters already computed.
+    if epoch:
+        value = step._scheduled_start_ts
+        if value is not None:
+            out["scheduled_start_time"] = value
+        value = step._scheduled_end_ts
+        if value is not None:
+            out["scheduled_end_time"] = value
+        value = step._actual_start_ts
+        if value is not None:
+            out["actual_start_time"] = value
+    else:
+        value = step._scheduled_start_time
+        if value:
+            out["scheduled_start_time"] = value.isoformat()
+        value = step._scheduled_end_time
+        if value:
+            out["scheduled_end_time"] = value.isoformat()
+        value = step._actual_start_time
+        if value:
+            out["actual_start_time"] = value.isoformat()
     # ``first_start_time`` is set on the very first start() and preserved
     # across pause/resume cycles; the Runner reads it for "when did this
     # step originally begin?" displays.
-    first_start_time = getattr(step, "first_start_time", None)
-    if first_start_time:
-        out["first_start_time"] = first_start_time.isoformat()
-    if step.actual_end_time:
-        out["actual_end_time"] = step.actual_end_time.isoformat()
-    if step.elapsed_time:
-        out["elapsed_seconds"] = step.elapsed_time.total_seconds()
+    value = getattr(step, "first_start_time", None)
+    if value:
+        out["first_start_time"] = value.timestamp() if epoch else value.isoformat()
+    if epoch:
+        value = step._actual_end_ts
+        if value is not None:
+            out["actual_end_time"] = value
+    else:
+        value = step._actual_end_time
+        if value:
+            out["actual_end_time"] = value.isoformat()
+    if step._elapsed_s:
+        out["elapsed_seconds"] = step._elapsed_s
 
+    if not dirty:
+        if epoch:
+            step._cached_epoch_dict = out
+        else:
+            step._cached_dict = out
     return out
 
 
-def experiment_to_dict(experiment) -> Dict[str, Any]:
+def _refresh_experiment_cache(experiment) -> None:
+    """Drop the experiment's cached renderings if it or any step is dirty.
+
+    Dirty steps have their own caches dropped here too, so the check is
+    consumed once per change and ``version`` advances exactly once.
+    """
+    stale = experiment._dirty
+    for step in experiment.steps.values():
+        if step._dirty:
+            step._cached_dict = step._cached_epoch_dict = None
+            step._dirty = False
+            stale = True
+    if stale:
+        experiment._cached_dict = experiment._cached_epoch_dict = None
+        experiment._cached_json = experiment._cached_epoch_json = None
+        experiment._dirty = False
+        experiment.version += 1
+
+
+def dumps_bytes(obj: Any, indent: bool = False) -> bytes:
+    """Encode ``obj`` as UTF-8 JSON (orjson when available).
+
+    Compact by default; ``indent=True`` pretty-prints with two spaces (used
+    for downloadable exports).
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    if indent:
+        return json.dumps(obj, indent=2).encode()
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+
+def experiment_to_json(experiment, epoch: bool = False) -> bytes:
+    """``experiment_to_dict`` encoded as JSON bytes, cached per version.
+
+    An unchanged experiment returns the same ``bytes`` object every call, so
+    list routes can join the blobs directly.
+    """
+    _refresh_experiment_cache(experiment)
+    cached = experiment._cached_epoch_json if epoch else experiment._cached_json
+    if cached is not None:
+        return cached
+    encoded = dumps_bytes(experiment_to_dict(experiment, epoch))
+    if epoch:
+        experiment._cached_epoch_json = encoded
+    else:
+        experiment._cached_json = encoded
+    return encoded
+
+
+def experiment_version(experiment) -> int:
+    """The experiment's ``version`` after folding in any pending dirty flags.
+
+    Read this (rather than the attribute) when the value has to describe the
+    state a serialization would produce now, e.g. for an ETag.
+    """
+    _refresh_experiment_cache(experiment)
+    return experiment.version
+
+
+def experiment_to_dict(experiment, epoch: bool = False) -> Dict[str, Any]:
     """Serialize an ``Experiment`` dataclass to its on-the-wire dict shape.
 
     The ``conflicts`` field is NOT attached here -- callers (specifically
     ``update_experiment``) layer it on after running ``check_for_conflicts``
     so the conflict list is available alongside the experiment without
     requiring this helper to know about the scheduler.
+
+    The result is a shallow copy of the cached dict, so callers may add or
+    drop top-level keys; the nested step dicts are shared and read-only.
+    Only steps whose ``_dirty`` flag is set are re-serialized.
     """
+    _refresh_experiment_cache(experiment)
+    cached = experiment._cached_epoch_dict if epoch else experiment._cached_dict
+    if cached is not None:
+        return dict(cached)
+
     steps: List[Dict[str, Any]] = [
-        step_to_dict(step) for _step_id, step in experiment.steps.items()
+        step_to_dict(step, epoch) for _step_id, step in experiment.steps.items()
     ]
 
     result: Dict[str, Any] = {
@@ -93,7 +236,11 @@ def experiment_to_dict(experiment) -> Dict[str, Any]:
     if hasattr(experiment, "shared_with"):
         result["shared_with"] = dict(experiment.shared_with or {})
 
-    return result
+    if epoch:
+        experiment._cached_epoch_dict = result
+    else:
+        experiment._cached_dict = result
+    return dict(result)
 
 
 def template_steps_payload(experiment) -> List[Dict[str, Any]]:
@@ -109,8 +256,8 @@ def template_steps_payload(experiment) -> List[Dict[str, Any]]:
         payload.append(
             {
                 "name": step.name,
-                "step_type": step.step_type.value,
-                "duration_seconds": step.duration.total_seconds() if step.duration else 0.0,
+                "step_type": step._type_value,
+                "duration_seconds": step._duration_seconds,
                 "dependencies": list(step.dependencies or []),
                 "notes": step.notes,
                 "resource_required": step.resource_needed,
@@ -128,3 +275,44 @@ def notification_to_dict(notification) -> Dict[str, Any]:
     prefer this entry point.
     """
     return notification.to_dict()
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson.
+
+    Install with ``app.json = OrjsonProvider(app)`` (only when ``orjson`` is
+    importable). ``response()`` hands orjson's bytes straight to the
+    response instead of round-tripping through ``str``. Naive datetimes are
+    serialized as-is (no ``OPT_NAIVE_UTC``): the scheduler stores local
+    wall-clock times, so tagging them as UTC would be wrong.
+    """
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj, default=self.default).decode()
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default), mimetype=self.mimetype
+        )
+
+
+class OrjsonSocketJSON:
+    """``json``-module stand-in backed by orjson, for Socket.IO packets.
+
+    Pass as ``SocketIO(app, json=OrjsonSocketJSON)`` (only when ``orjson`` is
+    importable). python-socketio calls ``dumps`` with stdlib keyword
+    arguments such as ``separators`` and expects ``str`` back; orjson's
+    output is already compact, so the keywords are ignored.
+    """
+
+    @staticmethod
+    def dumps(obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj).decode()
+
+    @staticmethod
+    def loads(s: str | bytes, **kwargs: Any) -> Any:
+        return orjson.loads(s)
@@ -13,6 +13,8 @@ os.environ.setdefault("JWT_SECRET_KEY", "test-secret-key")
 # Default to in-memory DB for the unit-test fixture; tests that need on-disk
 # persistence (test_persistence.py) override via build_app_with_db.
 os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+# Minimum bcrypt cost: the suite registers a user per test.
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
 
 
 def _reset_db_for(app):
@@ -39,11 +41,13 @@ def app():
     # Reset the in-memory scheduler cache too -- otherwise dataclass objects
     # from the previous test linger and confuse "is this experiment new?" logic.
     main_module.scheduler.reset_cache()
+    main_module.auth.clear_user_cache()
 
     yield main_module.app
 
     _reset_db_for(main_module.app)
     main_module.scheduler.reset_cache()
+    main_module.auth.clear_user_cache()
 
 
 @pytest.fixture
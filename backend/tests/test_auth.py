@@ -104,3 +104,85 @@ def test_me_rejects_garbage_token(client):
         headers={"Authorization": "Bearer not-a-real-token"},
     )
     assert response.status_code in (401, 422)
+
+
+def test_get_user_is_served_from_lru_after_first_lookup(app, client):
+    import auth
+    import main
+
+    client.post(
+        "/api/auth/register",
+        json={"username": "carol", "email": "carol@example.com", "password": "pw12345"},
+    )
+    with app.app_context():
+        first = main.get_user("carol")
+        assert first is not None
+        assert "carol" in auth._recent_users
+
+        # Each hit is the caller's own copy: mutating it leaks nowhere.
+        second = main.get_user("carol")
+        assert second is not first
+        assert second.id == first.id
+        second.shared_experiments["exp-1"] = "view"
+        assert main.get_user("carol").shared_experiments == {}
+
+        auth.clear_user_cache()
+        assert main.get_user("carol") is not first
+        assert main.get_user("nobody") is None
+
+
+def test_persist_user_failure_drops_the_cached_user(app, client, monkeypatch):
+    import auth
+    import main
+    from db import db
+
+    client.post(
+        "/api/auth/register",
+        json={"username": "dave", "email": "dave@example.com", "password": "pw12345"},
+    )
+    with app.app_context():
+        user = main.get_user("dave")
+        user.shared_experiments["exp-1"] = "edit"
+
+        def fail():
+            raise RuntimeError("commit failed")
+
+        monkeypatch.setattr(db.session, "commit", fail)
+        try:
+            auth.persist_user(user)
+        except RuntimeError:
+            pass
+        monkeypatch.undo()
+
+        assert "dave" not in auth._recent_users
+        assert main.get_user("dave").shared_experiments == {}
+
+
+def test_user_lru_is_bounded(monkeypatch):
+    import auth
+    from models import User
+
+    monkeypatch.setattr(auth, "_USER_CACHE_SIZE", 2)
+    auth.clear_user_cache()
+    for name in ("u1", "u2", "u3"):
+        user = User.__new__(User)
+        user.username = name
+        user.shared_experiments = {}
+        auth._cache_put(user)
+
+    assert auth._cache_get("u1") is None
+    assert auth._cache_get("u3") is not None
+    auth.clear_user_cache()
+
+
+def test_password_hash_uses_configured_bcrypt_rounds(client):
+    from models import User, _BCRYPT_ROUNDS
+
+    user = User("carol", "carol@example.com", "pw12345")
+    assert user.password_hash.startswith(f"$2b${_BCRYPT_ROUNDS:02d}$")
+    assert user.check_password("pw12345")
+    assert not user.check_password("wrong")
+
+    user.password_hash = user._hash_password("pw12345", rounds=5)
+    assert user.password_hash.startswith("$2b$05$")
+    assert user.check_password("pw12345")
@@ -18,6 +18,8 @@ These tests assert end-to-end behaviour through the HTTP layer:
 * The owner of the experiment is the recipient (``target_user``), not the
   requesting user (regression test for shared-edit clients calling
   ``complete`` on a non-owner's experiment).
+* ``NotificationService.batch()`` commits once and emits once per user.
+* Retrying a transition the step already made notifies nobody again.
 
 We poke at notifications via ``notification_service.get_user_notifications``
 which queries the same ``NotificationORM`` table that the GET route
@@ -302,3 +304,192 @@ def test_notification_target_user_is_owner_not_requester(client, auth_headers):
 
     assert len(alice_rows) == 1
     assert len(bob_rows) == 0
+
+
+# ---------------------------------------------------------------------------
+# 6. batch() coalesces socket emits per user.
+# ---------------------------------------------------------------------------
+class _RecordingSocket:
+    def __init__(self):
+        self.emits = []
+
+    def emit(self, event, data, room=None):
+        self.emits.append((event, data, room))
+
+
+def test_batch_emits_once_per_user_and_commits_every_row(client, auth_headers):
+    import main as main_module
+    from notifications import Notification, NotificationService
+
+    register_user(client, "carol")
+    socket = _RecordingSocket()
+    service = NotificationService(socket)
+
+    def _note(title, users):
+        return Notification(
+            title=title, message=title,
+            notification_type=NotificationType.GENERAL_INFO, target_users=users,
+        )
+
+    with main_module.app.app_context():
+        with service.batch():
+            service.add_notification(_note("one", ["alice"]))
+            with service.batch():
+                service.add_notification(_note("two", ["alice"]))
+                service.add_notification(_note("for-carol", ["carol"]))
+            assert socket.emits == []
+
+        assert sorted((e, r) for e, _d, r in socket.emits) == [
+            ("notification", "user_carol"),
+            ("notifications", "user_alice"),
+        ]
+        alice_batch = next(d for e, d, r in socket.emits if r == "user_alice")
+        assert [n["title"] for n in alice_batch] == ["one", "two"]
+        assert len(service.get_user_notifications("alice")) == 2
+
+        # Outside a batch: one emit per notification, as before.
+        service.add_notification(_note("three", ["carol"]))
+        assert socket.emits[-1][0] == "notification"
+
+
+def test_batch_that_raises_emits_nothing(client, auth_headers):
+    import main as main_module
+    from db import db
+    from notifications import Notification, NotificationService
+
+    socket = _RecordingSocket()
+    service = NotificationService(socket)
+
+    with main_module.app.app_context():
+        try:
+            with service.batch():
+                service.add_notification(Notification(
+                    title="lost", message="lost",
+                    notification_type=NotificationType.GENERAL_INFO, target_users=["alice"],
+                ))
+                raise RuntimeError("boom")
+        except RuntimeError:
+            db.session.rollback()
+
+        assert socket.emits == []
+        assert service.get_user_notifications("alice") == []
+        # The service is usable again afterwards: no batch left open.
+        service.add_notification(Notification(
+            title="later", message="later",
+            notification_type=NotificationType.GENERAL_INFO, target_users=["alice"],
+        ))
+        assert [e for e, _d, _r in socket.emits] == ["notification"]
+
+
+# ---------------------------------------------------------------------------
+# 7. Retried transitions are no-ops: no duplicate notifications.
+# ---------------------------------------------------------------------------
+def test_retried_complete_does_not_renotify(client, auth_headers):
+    exp = _create_experiment_with_chain(client, auth_headers, "RetryExp")
+    s1_id = exp["steps"][0]["id"]
+    _force_step(s1_id, StepStatus.RUNNING, set_actual_start=True)
+    _force_step(exp["steps"][1]["id"], StepStatus.PENDING)
+
+    for _ in range(2):
+        r = client.post(f"/api/steps/{s1_id}/complete", headers=auth_headers)
+        assert r.status_code == 200, r.get_json()
+        s1 = next(s for s in r.get_json()["steps"] if s["id"] == s1_id)
+        assert s1["status"] == StepStatus.COMPLETED.value
+
+    assert len(_owner_notifications("alice", NotificationType.STEP_COMPLETED)) == 1
+    assert len(_owner_notifications("alice", NotificationType.STEP_READY)) == 1
+
+
+def test_notification_objects_are_slotted():
+    from notifications import ActionType, Notification, NotificationAction
+
+    action = NotificationAction("view", ActionType.LINK, "View")
+    n = Notification("t", "m", NotificationType.GENERAL_INFO, actions=[action])
+    assert not hasattr(n, "__dict__")
+    assert not hasattr(action, "__dict__")
+    assert Notification.from_dict(n.to_dict()).to_dict() == n.to_dict()
+
+
+def test_notification_json_bytes_match_to_dict(client, auth_headers):
+    import json
+
+    from notifications import ActionType, Notification, NotificationAction
+
+    action = NotificationAction("view", ActionType.LINK, "View", data={"url": "/x"})
+    n = Notification("t", "m", NotificationType.STEP_READY, actions=[action], metadata={"k": 1})
+    assert json.loads(n.to_json_bytes()) == n.to_dict()
+
+    # The list route joins the per-notification encodings.
+    import main as main_module
+
+    with main_module.app.app_context():
+        n.target_users = ["alice"]
+        main_module.notification_service.add_notification(n)
+    r = client.get("/api/notifications", headers=auth_headers)
+    assert r.status_code == 200
+    assert [item["id"] for item in r.get_json()] == [n.id]
+    assert r.get_json()[0]["created_at"] == n.created_at.isoformat()
+
+
+def test_read_dismiss_and_delete_update_rows_in_place(client, auth_headers):
+    import main as main_module
+    from notifications import Notification
+
+    n = Notification("t", "m", NotificationType.GENERAL_INFO, target_users=["alice"])
+    with main_module.app.app_context():
+        main_module.notification_service.add_notification(n)
+
+    assert client.post(f"/api/notifications/{n.id}/read", headers=auth_headers).status_code == 200
+    assert client.post(f"/api/notifications/{n.id}/dismiss", headers=auth_headers).status_code == 200
+    (row,) = _owner_notifications("alice")
+    assert row.is_read and row.is_dismissed
+
+    assert client.delete(f"/api/notifications/{n.id}", headers=auth_headers).status_code == 200
+    assert _owner_notifications("alice") == []
+    assert client.delete(f"/api/notifications/{n.id}", headers=auth_headers).status_code == 404
+
+
+def test_type_handlers_attach_actions_from_shared_prototypes():
+    from notifications import Notification, NotificationService, _START_STEP_ACTION
+
+    service = NotificationService(socketio=None)
+    first = Notification("t", "m", NotificationType.STEP_READY, step_id="s1")
+    second = Notification("t", "m", NotificationType.STEP_READY, step_id="s2")
+    service._handle_step_ready(first)
+    service._handle_step_ready(second)
+
+    assert [a.to_dict() for a in first.actions] == [
+        {"id": "start_step", "type": "button", "label": "Start Step", "data": {"step_id": "s1"}}
+    ]
+    assert second.actions[0].data == {"step_id": "s2"}
+    # Copies, so the prototype's (empty) data is never shared or mutated.
+    assert first.actions[0] is not _START_STEP_ACTION
+    assert _START_STEP_ACTION.data == {}
+
+
+def test_notification_to_dict_is_built_once_and_tracks_flags():
+    from notifications import Notification
+
+    n = Notification("t", "m", NotificationType.GENERAL_INFO, target_users=["alice"])
+    first = n.to_dict()
+    n.is_read = True
+    second = n.to_dict()
+
+    assert first["is_read"] is False and second["is_read"] is True
+    assert first is not second
+    # Nested values come from the one cached build.
+    assert first["actions"] is second["actions"]
+
+
+def test_users_sent_the_same_batch_share_one_emit():
+    from notifications import NotificationService
+
+    socket = _RecordingSocket()
+    service = NotificationService(socket)
+    shared, other = {"id": "n1"}, {"id": "n2"}
+    service._emit_pending({"alice": [shared], "bob": [shared], "carol": [shared, other]})
+
+    assert socket.emits == [
+        ("notification", shared, ["user_alice", "user_bob"]),
+        ("notifications", [shared, other], "user_carol"),
+    ]
@@ -8,6 +8,8 @@ Covers:
 - Missing-JWT spot checks on every previously-unprotected route -> 401.
 - /api/users/search prefix-matching (case-insensitive), empty-q rejection,
   and email non-leakage.
+- Templates are private to their owner (404 for anyone else).
+- /api/user/experiments lists owned then shared experiments, each once.
 """
 from tests.conftest import register_user
 
@@ -280,3 +282,41 @@ def test_unrelated_user_gets_404_on_step_transition(client, auth_headers, second
 
     r = client.post(f"/api/steps/{step_id}/start", headers=second_user_headers)
     assert r.status_code == 404
+
+
+def test_templates_are_private_to_their_owner(client, auth_headers, second_user_headers):
+    exp = _create_experiment(client, auth_headers, "TemplateSource")
+    r = client.post(
+        "/api/templates", headers=auth_headers, json={"experiment_id": exp["id"], "name": "T"}
+    )
+    assert r.status_code == 201, r.get_json()
+    template_id = r.get_json()["id"]
+
+    # Bob can neither instantiate nor delete Alice's template.
+    r = client.post(
+        f"/api/experiments/create-from-template/{template_id}", headers=second_user_headers, json={}
+    )
+    assert r.status_code == 404
+    r = client.delete(f"/api/templates/{template_id}", headers=second_user_headers)
+    assert r.status_code == 404
+
+    r = client.post(
+        f"/api/experiments/create-from-template/{template_id}", headers=auth_headers, json={}
+    )
+    assert r.status_code == 201, r.get_json()
+    r = client.delete(f"/api/templates/{template_id}", headers=auth_headers)
+    assert r.status_code == 200
+    r = client.delete(f"/api/templates/{template_id}", headers=auth_headers)
+    assert r.status_code == 404
+
+
+def test_user_experiments_lists_owned_then_shared_once(client, auth_headers, second_user_headers):
+    mine = _create_experiment(client, second_user_headers, "BobOwn", with_steps=False)
+    theirs = _create_experiment(client, auth_headers, "AliceShared", with_steps=False)
+    _share(client, auth_headers, theirs["id"], "bob", "view")
+    # Re-sharing with a different permission must not duplicate the entry.
+    _share(client, auth_headers, theirs["id"], "bob", "edit")
+
+    r = client.get("/api/user/experiments", headers=second_user_headers)
+    assert r.status_code == 200
+    assert [e["id"] for e in r.get_json()] == [mine["id"], theirs["id"]]
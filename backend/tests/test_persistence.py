@@ -326,6 +326,47 @@ def test_notification_round_trip_across_restart(tmp_path):
         db.engine.dispose()
 
 
+def test_restart_adds_indexes_missing_from_an_existing_db(tmp_path):
+    import sqlite3
+    from db import db
+
+    db_file = tmp_path / "runtimex-index.db"
+    uri = f"sqlite:///{db_file}"
+    index_name = "ix_notifications_target_user_created_at"
+
+    app1, _, _ = _build_isolated_app(uri)
+    with app1.app_context():
+        db.session.remove()
+        db.engine.dispose()
+    with sqlite3.connect(db_file) as conn:
+        conn.execute(f"DROP INDEX {index_name}")
+
+    app2, _, _ = _build_isolated_app(uri)
+    with app2.app_context():
+        db.session.remove()
+        db.engine.dispose()
+    with sqlite3.connect(db_file) as conn:
+        names = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        plan = " ".join(
+            row[-1] for row in conn.execute(
+                "EXPLAIN QUERY PLAN SELECT * FROM notifications "
+                "WHERE target_user = 'x' ORDER BY created_at DESC"
+            )
+        )
+        unread_plan = " ".join(
+            row[-1] for row in conn.execute(
+                "EXPLAIN QUERY PLAN SELECT * FROM notifications "
+                "WHERE target_user = 'x' AND is_read = 0 ORDER BY created_at DESC"
+            )
+        )
+    assert index_name in names
+    # Newest-first listing walks an index instead of sorting; unread-only
+    # seeks to the user's unread rows.
+    assert index_name in plan and "TEMP B-TREE" not in plan
+    assert "ix_notifications_target_user_is_read_created_at" in unread_plan
+    assert "TEMP B-TREE" not in unread_plan
+
+
 # ---------------------------------------------------------------------------
 # Test 6: empty resource_required doesn't break persistence.
 # ---------------------------------------------------------------------------
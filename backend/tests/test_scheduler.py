@@ -0,0 +1,504 @@
+"""In-process scheduler tests.
+
+These drive ``Scheduler`` directly against hand-built ``Experiment``
+instances, outside any app context -- the persistence fan-out is skipped
+(the scheduler swallows the ``RuntimeError``), which keeps the assertions
+about scheduling order and timing rather than about the DB.
+"""
+from datetime import datetime, timedelta
+
+from models import Experiment, Step, StepStatus, StepType
+from scheduler import Scheduler
+
+
+BASE = datetime(2026, 1, 1, 9, 0, 0)
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+def _step(name, minutes, deps=None):
+    return Step(
+        name=name,
+        duration=timedelta(minutes=minutes),
+        step_type=StepType.TASK,
+        dependencies=deps or [],
+    )
+
+
+def _bare_scheduler(*experiments):
+    """Register experiments on a Scheduler without touching the DB."""
+    scheduler = Scheduler()
+    # Mark hydrated so the property accessors don't try (and fail) to
+    # reload from the DB and wipe what we register here.
+    scheduler._hydrated = True
+    for exp in experiments:
+        scheduler._experiments[exp.id] = exp
+        for step_id, step in exp.steps.items():
+            scheduler._schedule[step_id] = step
+    return scheduler
+
+
+# ---------------------------------------------------------------------------
+# Topological scheduling
+# ---------------------------------------------------------------------------
+def test_chain_added_out_of_order_is_scheduled_in_one_pass():
+    """C -> B -> A inserted as [C, B, A] still schedules A, then B, then C."""
+    a = _step("A", 10)
+    b = _step("B", 20, deps=[a.id])
+    c = _step("C", 30, deps=[b.id])
+    exp = Experiment(name="Chain")
+    for s in (c, b, a):
+        exp.add_step(s)
+    scheduler = _bare_scheduler(exp)
+
+    scheduler.calculate_initial_schedule(start_time=BASE)
+
+    assert a.scheduled_start_time == BASE
+    assert b.scheduled_start_time == a.scheduled_end_time
+    assert c.scheduled_start_time == b.scheduled_end_time
+    assert c.scheduled_end_time == BASE + timedelta(minutes=60)
+    assert a.status == StepStatus.READY
+    assert b.status == StepStatus.PENDING
+
+
+def test_cycle_is_left_unscheduled(caplog):
+    a = _step("A", 10)
+    b = _step("B", 10, deps=[a.id])
+    a.dependencies = [b.id]
+    free = _step("Free", 5)
+    exp = Experiment(name="Cycle")
+    for s in (a, b, free):
+        exp.add_step(s)
+    scheduler = _bare_scheduler(exp)
+
+    scheduler.calculate_initial_schedule(start_time=BASE)
+
+    assert free.scheduled_start_time == BASE
+    assert a.scheduled_start_time is None
+    assert b.scheduled_start_time is None
+    assert "2 step(s) left unscheduled: A, B." in caplog.text
+
+
+def test_topological_order_is_cached_until_invalidated():
+    a = _step("A", 10)
+    b = _step("B", 10, deps=[a.id])
+    exp = Experiment(name="Cached")
+    exp.add_step(b)
+    exp.add_step(a)
+    scheduler = _bare_scheduler(exp)
+
+    first = Scheduler._topological_order(exp)
+    assert first == [a.id, b.id]
+    assert Scheduler._topological_order(exp) is first
+
+    scheduler.invalidate_topology(exp.id)
+    assert exp._topo_order is None
+    assert Scheduler._topological_order(exp) == [a.id, b.id]
+
+
+# ---------------------------------------------------------------------------
+# step -> experiment reverse index
+# ---------------------------------------------------------------------------
+def test_step_to_experiment_index_tracks_upserts(client, auth_headers):
+    import main as main_module
+
+    r = client.post(
+        "/api/experiments",
+        headers=auth_headers,
+        json={"name": "Indexed", "steps": [{"name": "S1", "duration_seconds": 60}]},
+    )
+    body = r.get_json()
+    s1_id = body["steps"][0]["id"]
+
+    with main_module.app.app_context():
+        scheduler = main_module.scheduler
+        assert scheduler.get_experiment_for_step(s1_id).id == body["id"]
+
+    # Replace S1 with a new step: the old ID drops out, the new one maps in.
+    r = client.put(
+        f"/api/experiments/{body['id']}",
+        headers=auth_headers,
+        json={"steps": [{"name": "S2", "duration_seconds": 60}]},
+    )
+    s2_id = r.get_json()["steps"][0]["id"]
+
+    with main_module.app.app_context():
+        assert scheduler.get_experiment_for_step(s1_id) is None
+        assert scheduler.get_experiment_for_step(s2_id).id == body["id"]
+
+
+def test_topological_order_breaks_ties_by_insertion_order():
+    """A released dependent inserted before an independent root comes first."""
+    root = _step("Root", 5)
+    child = _step("Child", 5, deps=[root.id])
+    other = _step("Other", 5)
+    exp = Experiment(name="Stable")
+    for s in (root, child, other):
+        exp.add_step(s)
+
+    assert Scheduler._topological_order(exp) == [root.id, child.id, other.id]
+
+
+def test_experiment_topo_order_is_rebuilt_after_add_step():
+    a = _step("A", 5)
+    b = _step("B", 5, deps=[a.id])
+    exp = Experiment(name="Owned")
+    exp.add_step(b)
+    assert exp.topo_order() == [b.id]
+
+    exp.add_step(a)
+    assert exp.topo_order() == [a.id, b.id]
+    assert Scheduler._topological_order(exp) is exp.topo_order()
+
+
+# ---------------------------------------------------------------------------
+# print_schedule ordering
+# ---------------------------------------------------------------------------
+def test_print_schedule_limit_prints_earliest_steps(capsys):
+    from main import print_schedule
+
+    late = _step("Late", 5)
+    early = _step("Early", 5)
+    unscheduled = _step("Unscheduled", 5)
+    late.scheduled_start_time = BASE + timedelta(hours=1)
+    early.scheduled_start_time = BASE
+    exp = Experiment(name="Printed")
+    for s in (unscheduled, late, early):
+        exp.add_step(s)
+    scheduler = _bare_scheduler(exp)
+    capsys.readouterr()
+
+    print_schedule(scheduler, limit=2)
+
+    out = capsys.readouterr().out
+    assert out.index("Early") < out.index("Late")
+    assert "Unscheduled" not in out
+
+
+def test_clock_strings_are_rendered_on_first_read():
+    step = _step("Clocked", 5)
+    step.scheduled_start_time = BASE
+    assert step._scheduled_start_str is None
+
+    assert step.clock_str("scheduled_start") == "09:00:00"
+    assert step._scheduled_start_str == "09:00:00"
+    assert step.clock_str("actual_end") is None
+
+    step.scheduled_start_time = BASE + timedelta(minutes=30)
+    assert step.clock_str("scheduled_start") == "09:30:00"
+
+
+# ---------------------------------------------------------------------------
+# Locking
+# ---------------------------------------------------------------------------
+def test_mutations_hold_the_scheduler_lock():
+    """Another thread can't enter a mutation while the lock is held."""
+    import threading
+
+    a = _step("A", 5)
+    exp = Experiment(name="Locked")
+    exp.add_step(a)
+    scheduler = _bare_scheduler(exp)
+
+    done = threading.Event()
+
+    def schedule():
+        scheduler.calculate_initial_schedule(start_time=BASE)
+        done.set()
+
+    with scheduler.locked():
+        worker = threading.Thread(target=schedule)
+        worker.start()
+        assert not done.wait(timeout=0.2)
+    assert done.wait(timeout=5)
+    worker.join()
+    assert a.scheduled_start_time == BASE
+
+
+# ---------------------------------------------------------------------------
+# Per-experiment re-planning
+# ---------------------------------------------------------------------------
+def test_only_replans_the_named_dirty_experiment():
+    a = _step("A", 10)
+    b = _step("B", 10)
+    exp_a = Experiment(name="ExpA")
+    exp_a.add_step(a)
+    exp_b = Experiment(name="ExpB")
+    exp_b.add_step(b)
+    scheduler = _bare_scheduler(exp_a, exp_b)
+    scheduler._dirty_experiments.update({exp_a.id, exp_b.id})
+
+    scheduler.calculate_initial_schedule(start_time=BASE, only=exp_b.id)
+    assert b.scheduled_start_time == BASE
+    assert a.scheduled_start_time is None
+    assert a.status == StepStatus.PENDING
+
+    # A clean experiment is a no-op, even with a different start time.
+    b.status = StepStatus.PENDING
+    scheduler.calculate_initial_schedule(start_time=BASE + timedelta(hours=1), only=exp_b.id)
+    assert b.status == StepStatus.PENDING
+
+
+# ---------------------------------------------------------------------------
+# Flat step index
+# ---------------------------------------------------------------------------
+def test_all_steps_is_the_flat_index_and_finds_ready_steps():
+    a = _step("A", 5)
+    b = _step("B", 5, deps=[a.id])
+    exp = Experiment(name="Flat")
+    exp.add_step(a)
+    exp.add_step(b)
+    scheduler = _bare_scheduler(exp)
+
+    assert scheduler.all_steps is scheduler.schedule
+    assert scheduler.next_ready_step() is None
+
+    scheduler.calculate_initial_schedule(start_time=BASE)
+    assert scheduler.next_ready_step() is a
+
+
+def test_next_ready_step_follows_release_order_and_drops_started_steps():
+    a = _step("A", 5)
+    b = _step("B", 5, deps=[a.id])
+    c = _step("C", 5)
+    exp = Experiment(name="Queue")
+    for s in (b, a, c):
+        exp.add_step(s)
+    scheduler = _bare_scheduler(exp)
+    scheduler.calculate_initial_schedule(start_time=BASE)
+
+    assert scheduler.next_ready_step() is a
+    a.start(BASE)
+    assert scheduler.next_ready_step() is c
+    a.complete(BASE + timedelta(minutes=5))
+    scheduler.update_ready_status()
+    c.start(BASE)
+    # B was released by A's completion and queued behind C.
+    assert scheduler.next_ready_step() is b
+
+
+def test_update_ready_status_returns_only_newly_released_steps():
+    a = _step("A", 5)
+    b = _step("B", 5, deps=[a.id])
+    c = _step("C", 5, deps=[a.id])
+    exp = Experiment(name="Released")
+    for s in (a, b, c):
+        exp.add_step(s)
+    scheduler = _bare_scheduler(exp)
+
+    assert scheduler.update_ready_status() == [a]
+    assert scheduler.update_ready_status() == []
+
+    a.start(BASE)
+    a.complete(BASE + timedelta(minutes=5))
+    assert scheduler.update_ready_status() == [b, c]
+
+
+# ---------------------------------------------------------------------------
+# Reverse dependency index
+# ---------------------------------------------------------------------------
+def test_completion_sweeps_only_the_completed_steps_dependents(monkeypatch):
+    a = _step("A", 5)
+    b = _step("B", 5, deps=[a.id])
+    c = _step("C", 5, deps=[b.id])
+    exp = Experiment(name="Dependents")
+    for s in (a, b, c):
+        exp.add_step(s)
+    scheduler = _bare_scheduler(exp)
+    scheduler.calculate_initial_schedule(start_time=BASE)
+    assert scheduler._build_reverse_deps() == {a.id: [b.id], b.id: [c.id]}
+
+    swept = []
+    original = Scheduler.update_ready_status
+
+    def spy(self, steps=None):
+        steps = list(self.schedule.values()) if steps is None else list(steps)
+        swept.append(steps)
+        return original(self, steps)
+
+    monkeypatch.setattr(Scheduler, "update_ready_status", spy)
+    monkeypatch.setattr(Scheduler, "_persist_step_state", lambda self, step: None)
+    a.start(BASE)
+
+    assert scheduler.handle_step_complete(a.id, BASE + timedelta(minutes=5)) == [b]
+    assert swept == [[b]]
+
+
+# ---------------------------------------------------------------------------
+# Upcoming steps
+# ---------------------------------------------------------------------------
+def test_upcoming_steps_reads_the_window_prefix_of_the_heaps():
+    start = datetime.now() + timedelta(minutes=10)
+    a = _step("A", 20)
+    b = _step("B", 40, deps=[a.id])
+    c = _step("C", 120, deps=[b.id])
+    exp = Experiment(name="Upcoming")
+    for s in (a, b, c):
+        exp.add_step(s)
+    scheduler = _bare_scheduler(exp)
+    scheduler.calculate_initial_schedule(start_time=start)
+
+    assert scheduler.get_upcoming_steps() == [a, b]
+    # A second query sees the same steps: in-window entries are kept.
+    assert scheduler.get_upcoming_steps() == [a, b]
+
+    # Re-planning B later leaves its old entry stale.
+    b.scheduled_start_time = start + timedelta(hours=2)
+    scheduler._push_timing(b)
+    assert scheduler.get_upcoming_steps() == [a]
+
+    # A running step is windowed on its expected end instead.
+    c.status = StepStatus.READY
+    c.start(datetime.now())
+    scheduler._push_timing(c)
+    assert scheduler.get_upcoming_steps() == [a]
+    assert scheduler.get_upcoming_steps(window=timedelta(hours=3)) == [a, c, b]
+
+
+def test_planning_pass_reuses_dependency_end_times(monkeypatch):
+    a = _step("A", 10)
+    b = _step("B", 10, deps=[a.id])
+    c = _step("C", 10, deps=[a.id])
+    exp = Experiment(name="Memo")
+    for s in (a, b, c):
+        exp.add_step(s)
+    scheduler = _bare_scheduler(exp)
+
+    looked_up = []
+    original = Scheduler.get_step
+
+    def spy(self, step_id):
+        looked_up.append(step_id)
+        return original(self, step_id)
+
+    monkeypatch.setattr(Scheduler, "get_step", spy)
+    scheduler.calculate_initial_schedule(start_time=BASE)
+
+    assert b.scheduled_start_time == c.scheduled_start_time == a.scheduled_end_time
+    # Planning B and C read A's end time from the pass cache.
+    assert a.id not in looked_up
+
+
+def test_start_runs_no_ready_sweep(monkeypatch):
+    a = _step("A", 5)
+    b = _step("B", 5, deps=[a.id])
+    exp = Experiment(name="NoSweep")
+    exp.add_step(a)
+    exp.add_step(b)
+    scheduler = _bare_scheduler(exp)
+    scheduler.calculate_initial_schedule(start_time=BASE)
+
+    def fail(self, steps=None):
+        raise AssertionError("start must not sweep")
+
+    monkeypatch.setattr(Scheduler, "update_ready_status", fail)
+    monkeypatch.setattr(Scheduler, "_persist_step_state", lambda self, step: None)
+
+    assert scheduler.handle_step_start(a.id, BASE) == []
+    assert a.status == StepStatus.RUNNING
+
+
+def test_add_experiment_extends_the_reverse_index_in_bulk(app):
+    import main as main_module
+
+    a = _step("A", 5)
+    b = _step("B", 5, deps=[a.id])
+    first = Experiment(name="First")
+    first.add_step(a)
+    first.add_step(b)
+    c = _step("C", 5, deps=[a.id])
+    second = Experiment(name="Second")
+    second.add_step(c)
+
+    with app.app_context():
+        scheduler = main_module.scheduler
+        scheduler.add_experiment(first)
+        dependents = scheduler._build_reverse_deps()
+        scheduler.add_experiment(second)
+
+        assert scheduler._dependents is dependents
+        assert dependents[a.id] == [b.id, c.id]
+        assert scheduler.get_experiment_for_step(c.id) is second
+        assert scheduler.all_steps[c.id] is c
+
+
+def test_add_step_appends_to_a_cached_topo_order_when_it_goes_last():
+    a = _step("A", 5)
+    b = _step("B", 5, deps=[a.id])
+    exp = Experiment(name="Appended")
+    exp.add_step(a)
+    order = exp.topo_order()
+
+    exp.add_step(b)
+    assert exp.topo_order() is order
+    assert order == [a.id, b.id]
+    assert exp._topo_index[b.id] == 1
+
+    # D was referenced before it existed, so adding it forces a rebuild.
+    c = _step("C", 5, deps=["later"])
+    exp.add_step(c)
+    d = _step("D", 5)
+    d.id = "later"
+    exp.add_step(d)
+    assert exp._topo_order is None
+    assert exp.topo_order() == [a.id, b.id, d.id, c.id]
+
+
+def test_scheduler_has_no_instance_dict():
+    scheduler = Scheduler()
+    assert not hasattr(scheduler, "__dict__")
+
+
+def test_timing_heaps_stay_bounded_and_drop_removed_steps(app, monkeypatch):
+    import main as main_module
+    import scheduler as scheduler_module
+
+    monkeypatch.setattr(scheduler_module, "_HEAP_COMPACT_MIN", 4)
+    start = datetime.now() + timedelta(hours=2)
+    steps = [_step(f"S{i}", 5) for i in range(5)]
+    exp = Experiment(name="Bounded")
+    for s in steps:
+        exp.add_step(s)
+
+    with app.app_context():
+        scheduler = main_module.scheduler
+        scheduler.add_experiment(exp)
+        scheduler.calculate_initial_schedule(start_time=start)
+        # Re-planning the same keys pushes nothing new.
+        size = len(scheduler._start_heap)
+        scheduler._push_timing(steps[0])
+        assert len(scheduler._start_heap) == size
+
+        # Repeatedly moving future starts would grow the heap forever.
+        for minutes in range(1, 50):
+            for s in steps:
+                s.scheduled_start_time = start + timedelta(minutes=minutes)
+                scheduler._push_timing(s)
+        assert len(scheduler._start_keys) == len(steps)
+        assert len(scheduler._start_heap) <= 2 * len(steps) + 4
+
+        scheduler.remove_experiment(exp.id)
+        assert scheduler._start_heap == []
+        assert scheduler._start_keys == {}
+
+
+def test_duration_edit_rekeys_a_running_step_for_upcoming(app):
+    import main as main_module
+
+    step = _step("Long", 5 * 60)
+    exp = Experiment(name="Rekeyed")
+    exp.add_step(step)
+
+    with app.app_context():
+        scheduler = main_module.scheduler
+        scheduler.add_experiment(exp)
+        step.status = StepStatus.READY
+        scheduler.handle_step_start(step.id)
+        assert scheduler.get_upcoming_steps(timedelta(hours=1)) == []
+
+        edited = _step("Long", 10)
+        edited.id = step.id
+        assert scheduler.upsert_experiment_steps(exp, [edited])
+
+        assert scheduler.get_upcoming_steps(timedelta(hours=1)) == [step]
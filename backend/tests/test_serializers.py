@@ -0,0 +1,393 @@
+"""Serializer cache tests.
+
+``experiment_to_dict`` / ``step_to_dict`` cache their output on the
+dataclasses and rebuild only what a mutation marked dirty. These tests pin
+the two properties that matter: an unchanged experiment reuses its cached
+step dicts, and every mutation path shows up in the next serialization.
+"""
+from datetime import datetime, timedelta
+
+from models import Experiment, Step, StepStatus, StepType
+from serializers import experiment_to_dict
+
+
+def _experiment_with_two_steps():
+    exp = Experiment(name="CacheExp")
+    s1 = Step(name="S1", duration=timedelta(seconds=60), step_type=StepType.TASK)
+    s2 = Step(name="S2", duration=timedelta(seconds=90), step_type=StepType.TASK)
+    exp.add_step(s1)
+    exp.add_step(s2)
+    return exp, s1, s2
+
+
+def test_unchanged_experiment_reuses_cached_step_dicts():
+    exp, _s1, _s2 = _experiment_with_two_steps()
+
+    first = experiment_to_dict(exp)
+    second = experiment_to_dict(exp)
+
+    assert first == second
+    # Shallow copy at the top level, shared step dicts underneath.
+    assert first is not second
+    assert first["steps"][0] is second["steps"][0]
+
+
+def test_step_transition_rebuilds_only_that_step():
+    exp, s1, _s2 = _experiment_with_two_steps()
+    before = experiment_to_dict(exp)
+
+    s1.status = StepStatus.READY
+    s1.start(start_time=datetime(2026, 1, 1, 12, 0, 0))
+    after = experiment_to_dict(exp)
+
+    assert after["steps"][0]["status"] == StepStatus.RUNNING.value
+    assert after["steps"][0] is not before["steps"][0]
+    assert after["steps"][1] is before["steps"][1]
+
+
+def test_caller_mutation_does_not_leak_into_cache():
+    exp, _s1, _s2 = _experiment_with_two_steps()
+    exp.owner = "alice"
+
+    payload = experiment_to_dict(exp)
+    del payload["owner"]
+    payload["conflicts"] = []
+
+    again = experiment_to_dict(exp)
+    assert again["owner"] == "alice"
+    assert "conflicts" not in again
+
+
+def test_put_rename_is_reflected_in_next_get(client, auth_headers):
+    r = client.post(
+        "/api/experiments",
+        headers=auth_headers,
+        json={"name": "Before", "steps": [{"name": "S1", "duration_seconds": 30}]},
+    )
+    assert r.status_code == 201, r.get_json()
+    body = r.get_json()
+
+    r = client.put(f"/api/experiments/{body['id']}", headers=auth_headers, json={"name": "After"})
+    assert r.status_code == 200, r.get_json()
+
+    r = client.get(f"/api/experiments/{body['id']}", headers=auth_headers)
+    assert r.get_json()["name"] == "After"
+
+
+def test_app_uses_orjson_provider_when_available():
+    import main as main_module
+    from serializers import OrjsonProvider, orjson
+
+    if orjson is None:
+        assert not isinstance(main_module.app.json, OrjsonProvider)
+    else:
+        assert isinstance(main_module.app.json, OrjsonProvider)
+
+
+def test_malformed_json_body_is_rejected(client, auth_headers):
+    r = client.post(
+        "/api/experiments",
+        headers={**auth_headers, "Content-Type": "application/json"},
+        data=b"{not json",
+    )
+    assert r.status_code == 400
+
+
+def test_epoch_format_emits_unix_seconds(client, auth_headers):
+    r = client.post(
+        "/api/experiments",
+        headers=auth_headers,
+        json={"name": "Epoch", "steps": [{"name": "S1", "duration_seconds": 60}]},
+    )
+    exp_id = r.get_json()["id"]
+
+    iso = client.get(f"/api/experiments/{exp_id}", headers=auth_headers).get_json()
+    epoch = client.get(f"/api/experiments/{exp_id}?format=epoch", headers=auth_headers).get_json()
+
+    iso_start = iso["steps"][0]["scheduled_start_time"]
+    epoch_start = epoch["steps"][0]["scheduled_start_time"]
+    assert isinstance(iso_start, str)
+    assert epoch_start == datetime.fromisoformat(iso_start).timestamp()
+    # The ISO cache is untouched by the epoch request.
+    again = client.get(f"/api/experiments/{exp_id}", headers=auth_headers).get_json()
+    assert again["steps"][0]["scheduled_start_time"] == iso_start
+
+
+def test_dirty_step_invalidates_both_formats():
+    exp = Experiment(name="Formats")
+    step = Step(name="S1", duration=timedelta(seconds=60), step_type=StepType.TASK)
+    exp.add_step(step)
+    experiment_to_dict(exp)
+    experiment_to_dict(exp, epoch=True)
+
+    step.scheduled_start_time = datetime(2026, 1, 1, 12, 0, 0)
+    step.mark_dirty()
+    assert "scheduled_start_time" in experiment_to_dict(exp)["steps"][0]
+    assert "scheduled_start_time" in experiment_to_dict(exp, epoch=True)["steps"][0]
+
+
+def test_experiment_list_streams_a_valid_json_array(client, auth_headers):
+    r = client.get("/api/experiments", headers=auth_headers)
+    assert r.status_code == 200
+    assert r.get_json() == []
+
+    for name in ("One", "Two"):
+        client.post("/api/experiments", headers=auth_headers, json={"name": name, "steps": []})
+
+    r = client.get("/api/experiments", headers=auth_headers)
+    assert r.mimetype == "application/json"
+    assert sorted(e["name"] for e in r.get_json()) == ["One", "Two"]
+
+
+def test_put_with_unchanged_steps_keeps_step_caches(client, auth_headers):
+    import main as main_module
+
+    r = client.post(
+        "/api/experiments",
+        headers=auth_headers,
+        json={"name": "Diff", "steps": [{"name": "S1", "duration_seconds": 30}]},
+    )
+    body = r.get_json()
+    step_payload = [
+        {"id": s["id"], "name": s["name"], "duration_seconds": s["duration_seconds"],
+         "step_type": s["step_type"], "dependencies": s["dependencies"]}
+        for s in body["steps"]
+    ]
+
+    with main_module.app.app_context():
+        step = main_module.scheduler.get_step(body["steps"][0]["id"])
+        cached = step._cached_dict
+        assert cached is not None
+
+    r = client.put(f"/api/experiments/{body['id']}", headers=auth_headers, json={"steps": step_payload})
+    assert r.status_code == 200, r.get_json()
+    with main_module.app.app_context():
+        assert step._cached_dict is cached
+        assert body["id"] not in main_module.scheduler._dirty_experiments
+
+    step_payload[0]["notes"] = "edited"
+    r = client.put(f"/api/experiments/{body['id']}", headers=auth_headers, json={"steps": step_payload})
+    assert r.get_json()["steps"][0]["notes"] == "edited"
+    # A notes-only edit re-serializes the step but doesn't move the plan.
+    assert r.get_json()["steps"][0]["scheduled_start_time"] == body["steps"][0]["scheduled_start_time"]
+
+
+def test_experiment_json_bytes_are_cached_per_version():
+    import json
+
+    from serializers import experiment_to_json
+
+    exp, s1, _s2 = _experiment_with_two_steps()
+    first = experiment_to_json(exp)
+    version = exp.version
+
+    assert experiment_to_json(exp) is first
+    assert exp.version == version
+    assert json.loads(first) == experiment_to_dict(exp)
+
+    s1.status = StepStatus.READY
+    second = experiment_to_json(exp)
+    assert exp.version == version + 1
+    assert second is not first
+    assert json.loads(second)["steps"][0]["status"] == StepStatus.READY.value
+
+
+def test_export_is_an_in_memory_attachment(client, auth_headers):
+    r = client.post(
+        "/api/experiments",
+        headers=auth_headers,
+        json={"name": "Export Me", "steps": [{"name": "S1", "duration_seconds": 30}]},
+    )
+    exp_id = r.get_json()["id"]
+
+    r = client.get(f"/api/experiments/{exp_id}/export", headers=auth_headers)
+    assert r.status_code == 200
+    assert r.mimetype == "application/json"
+    assert "attachment" in r.headers["Content-Disposition"]
+    assert "Export_Me_export.json" in r.headers["Content-Disposition"]
+    body = r.get_json()
+    assert body["name"] == "Export Me"
+    assert "owner" not in body and "shared_with" not in body
+
+
+def test_json_responses_are_gzipped_when_accepted(client, auth_headers):
+    import gzip
+    import json
+
+    steps = [{"name": f"S{i}", "duration_seconds": 30, "notes": "x" * 50} for i in range(10)]
+    r = client.post("/api/experiments", headers=auth_headers, json={"name": "Zip", "steps": steps})
+    exp_id = r.get_json()["id"]
+    gz_headers = {**auth_headers, "Accept-Encoding": "gzip"}
+
+    # Buffered route.
+    r = client.get(f"/api/experiments/{exp_id}", headers=gz_headers)
+    assert r.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in r.headers["Vary"]
+    assert json.loads(gzip.decompress(r.data))["id"] == exp_id
+
+    # Streamed list route.
+    r = client.get("/api/experiments", headers=gz_headers)
+    assert r.headers["Content-Encoding"] == "gzip"
+    assert [e["id"] for e in json.loads(gzip.decompress(r.data))] == [exp_id]
+
+    # No Accept-Encoding: plain JSON, as before.
+    r = client.get(f"/api/experiments/{exp_id}", headers=auth_headers)
+    assert "Content-Encoding" not in r.headers
+    assert r.get_json()["id"] == exp_id
+
+
+def test_state_transition_reuses_the_static_step_skeleton():
+    from serializers import step_to_dict
+
+    exp, s1, _s2 = _experiment_with_two_steps()
+    step_to_dict(s1)
+    skeleton = s1._static_dict
+
+    s1.status = StepStatus.READY
+    assert step_to_dict(s1)["status"] == StepStatus.READY.value
+    assert s1._static_dict is skeleton
+
+    s1.notes = "edited"
+    s1.mark_edited()
+    assert step_to_dict(s1)["notes"] == "edited"
+    assert s1._static_dict is not skeleton
+
+    s1.duration = timedelta(seconds=5)
+    assert step_to_dict(s1)["duration_seconds"] == 5.0
+
+
+def test_serializing_a_single_step_leaves_the_change_to_its_experiment():
+    from serializers import experiment_to_dict, experiment_version, step_to_dict
+
+    exp, s1, _s2 = _experiment_with_two_steps()
+    experiment_to_dict(exp)
+    version = experiment_version(exp)
+
+    # A time-only change marks the step dirty by itself.
+    s1.scheduled_start_time = datetime(2026, 1, 1, 9, 0, 0)
+    assert s1._dirty
+    assert step_to_dict(s1)["scheduled_start_time"] == "2026-01-01T09:00:00"
+    assert s1._dirty
+
+    assert experiment_version(exp) == version + 1
+    assert experiment_to_dict(exp)["steps"][0]["scheduled_start_time"] == "2026-01-01T09:00:00"
+
+
+def test_export_round_trips_through_import(client, auth_headers):
+    import io
+
+    r = client.post(
+        "/api/experiments",
+        headers=auth_headers,
+        json={"name": "RoundTrip", "steps": [{"name": "S1", "duration_seconds": 45}]},
+    )
+    exp_id = r.get_json()["id"]
+    exported = client.get(f"/api/experiments/{exp_id}/export", headers=auth_headers).data
+
+    r = client.post(
+        "/api/experiments/import",
+        headers=auth_headers,
+        data={"file": (io.BytesIO(exported), "roundtrip.json")},
+        content_type="multipart/form-data",
+    )
+    assert r.status_code == 201, r.get_json()
+    imported = r.get_json()
+    assert imported["id"] != exp_id
+    assert [(s["name"], s["duration_seconds"]) for s in imported["steps"]] == [("S1", 45.0)]
+
+    r = client.post(
+        "/api/experiments/import",
+        headers=auth_headers,
+        data={"file": (io.BytesIO(b"{broken"), "broken.json")},
+        content_type="multipart/form-data",
+    )
+    assert r.status_code == 400
+    assert r.get_json()["error"] == "Invalid JSON file"
+
+
+def test_socketio_packets_use_orjson_when_available(client, auth_headers):
+    import main as main_module
+    from serializers import OrjsonSocketJSON, orjson
+
+    if orjson is None:
+        assert "json" not in main_module.socketio.server_options
+        return
+    assert main_module.socketio.server_options["json"] is OrjsonSocketJSON
+    encoded = OrjsonSocketJSON.dumps({"a": [1, "b"]}, separators=(",", ":"))
+    assert encoded == '{"a":[1,"b"]}'
+    assert OrjsonSocketJSON.loads(encoded) == {"a": [1, "b"]}
+
+    # An emit-driving route still works end to end with the shim installed.
+    sio = main_module.socketio.test_client(main_module.app)
+    r = client.post(
+        "/api/experiments",
+        headers=auth_headers,
+        json={"name": "Sock", "steps": [{"name": "S1", "duration_seconds": 5}]},
+    )
+    step_id = r.get_json()["steps"][0]["id"]
+    client.post(f"/api/steps/{step_id}/start", headers=auth_headers)
+    updates = [m for m in sio.get_received() if m["name"] == "experiment_update"]
+    assert updates and updates[-1]["args"][0]["steps"][0]["status"] == "running"
+    sio.disconnect()
+
+
+def test_experiment_reads_revalidate_with_weak_etags(client, auth_headers):
+    r = client.post(
+        "/api/experiments",
+        headers=auth_headers,
+        json={"name": "Tagged", "steps": [{"name": "S1", "duration_seconds": 30}]},
+    )
+    exp_id = r.get_json()["id"]
+
+    for url in (f"/api/experiments/{exp_id}", "/api/experiments", "/api/user/experiments"):
+        r = client.get(url, headers=auth_headers)
+        etag = r.headers["ETag"]
+        assert etag.startswith('W/"')
+
+        r = client.get(url, headers={**auth_headers, "If-None-Match": etag})
+        assert r.status_code == 304
+        assert r.data == b""
+        assert r.headers["ETag"] == etag
+
+    single = client.get(f"/api/experiments/{exp_id}", headers=auth_headers).headers["ETag"]
+    listed = client.get("/api/experiments", headers=auth_headers).headers["ETag"]
+    client.put(f"/api/experiments/{exp_id}", headers=auth_headers, json={"name": "Renamed"})
+
+    r = client.get(f"/api/experiments/{exp_id}", headers={**auth_headers, "If-None-Match": single})
+    assert r.status_code == 200
+    assert r.get_json()["name"] == "Renamed"
+    r = client.get("/api/experiments", headers={**auth_headers, "If-None-Match": listed})
+    assert r.status_code == 200
+
+
+def test_etags_differ_between_time_formats(client, auth_headers):
+    r = client.post(
+        "/api/experiments",
+        headers=auth_headers,
+        json={"name": "Formats", "steps": [{"name": "S1", "duration_seconds": 30}]},
+    )
+    exp_id = r.get_json()["id"]
+
+    for url in (f"/api/experiments/{exp_id}", "/api/experiments", "/api/user/experiments"):
+        r = client.get(url, headers=auth_headers)
+        r.get_data()  # drain streamed list bodies
+        iso_tag = r.headers["ETag"]
+
+        r = client.get(
+            f"{url}?format=epoch", headers={**auth_headers, "If-None-Match": iso_tag}
+        )
+        assert r.status_code == 200
+        assert r.get_json()
+        assert r.headers["ETag"] != iso_tag
+        epoch_tag = r.headers["ETag"]
+
+        r = client.get(url, headers={**auth_headers, "If-None-Match": epoch_tag})
+        assert r.status_code == 200
+        assert r.get_json()
+        assert r.headers["ETag"] == iso_tag
+
+    single = client.get(f"/api/experiments/{exp_id}", headers=auth_headers).headers["ETag"]
+    r = client.get(
+        f"/api/experiments/{exp_id}/export", headers={**auth_headers, "If-None-Match": single}
+    )
+    assert r.status_code == 200
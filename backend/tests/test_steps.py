@@ -7,6 +7,8 @@ Covers:
 * ``Step.get_expected_end_time`` for RUNNING vs PAUSED, accounting for the
   accumulated ``elapsed_time``.
 * ``Step.first_start_time`` set on first start only, preserved on resume.
+* ``POST /api/steps/events`` batch route (ordered apply, one payload per
+  touched experiment, whole-batch rejection).
 
 The skip route is the symmetric counterpart of the existing complete route;
 its tests mirror ``test_permissions.py``'s shape on purpose.
@@ -203,3 +205,218 @@ def test_duration_seconds_round_trip_under_60_seconds(client, auth_headers):
         f"sub-minute step truncated to {blink['duration_seconds']} "
         f"(would be the // 60 bug)"
     )
+
+
+# ---------------------------------------------------------------------------
+# 7. Slotted dataclasses: no per-instance __dict__.
+# ---------------------------------------------------------------------------
+def test_step_and_experiment_are_slotted():
+    from models import Experiment
+
+    step = Step(name="slotted", duration=timedelta(seconds=5))
+    exp = Experiment(name="slotted")
+    assert not hasattr(step, "__dict__")
+    assert not hasattr(exp, "__dict__")
+    # Route-attached extras are declared but unset until assigned.
+    assert not hasattr(exp, "owner")
+    exp.owner = "alice"
+    assert exp.owner == "alice"
+
+
+# ---------------------------------------------------------------------------
+# 8. POST /api/steps/events batch route
+# ---------------------------------------------------------------------------
+def test_step_events_batch_applies_in_order_and_returns_each_experiment_once(
+    client, auth_headers
+):
+    exp = _create_experiment(client, auth_headers, "BatchExp")
+    s1, s2 = (s["id"] for s in exp["steps"])
+    _force_step_ready(s1)
+    _force_step_ready(s2)
+
+    started = "2026-01-01T09:00:00"
+    r = client.post(
+        "/api/steps/events",
+        headers=auth_headers,
+        json=[
+            {"step_id": s1, "event": "start", "timestamp": started},
+            {"step_id": s1, "event": "complete"},
+            {"step_id": s2, "event": "skip"},
+        ],
+    )
+    assert r.status_code == 200, r.get_json()
+
+    payload = r.get_json()
+    assert [e["id"] for e in payload] == [exp["id"]]
+    steps = {s["id"]: s for s in payload[0]["steps"]}
+    assert steps[s1]["status"] == StepStatus.COMPLETED.value
+    assert steps[s1]["actual_start_time"] == started
+    assert steps[s2]["status"] == StepStatus.SKIPPED.value
+
+
+def test_step_events_batch_is_rejected_whole_on_a_bad_entry(
+    client, auth_headers, second_user_headers
+):
+    exp = _create_experiment(client, auth_headers, "BatchRejectExp")
+    s1 = exp["steps"][0]["id"]
+    _force_step_ready(s1)
+
+    r = client.post(
+        "/api/steps/events",
+        headers=auth_headers,
+        json=[{"step_id": s1, "event": "start"}, {"step_id": s1, "event": "explode"}],
+    )
+    assert r.status_code == 400
+
+    # Unrelated user: existence privacy, same as the single-step routes.
+    r = client.post(
+        "/api/steps/events",
+        headers=second_user_headers,
+        json=[{"step_id": s1, "event": "start"}],
+    )
+    assert r.status_code == 404
+
+    r = client.get(f"/api/experiments/{exp['id']}", headers=auth_headers)
+    assert r.get_json()["steps"][0]["status"] == StepStatus.READY.value
+
+
+def test_step_events_batch_reads_the_clock_once(client, auth_headers):
+    exp = _create_experiment(client, auth_headers, "BatchClockExp")
+    s1, s2 = (s["id"] for s in exp["steps"])
+    _force_step_ready(s1)
+    _force_step_ready(s2)
+
+    r = client.post(
+        "/api/steps/events",
+        headers=auth_headers,
+        json=[{"step_id": s1, "event": "start"}, {"step_id": s2, "event": "start"}],
+    )
+    assert r.status_code == 200, r.get_json()
+    steps = {s["id"]: s for s in r.get_json()[0]["steps"]}
+    assert steps[s1]["actual_start_time"] == steps[s2]["actual_start_time"]
+
+
+def test_step_events_batch_announces_only_transitions_that_happened(client, auth_headers):
+    exp = _create_experiment(client, auth_headers, "BatchRejectedExp")
+    s1 = exp["steps"][0]["id"]
+    _force_step_ready(s1)
+
+    # A READY step can't be completed without starting it first.
+    r = client.post(
+        "/api/steps/events",
+        headers=auth_headers,
+        json=[{"step_id": s1, "event": "complete"}],
+    )
+    assert r.status_code == 200, r.get_json()
+    assert r.get_json()[0]["steps"][0]["status"] == StepStatus.READY.value
+
+    notifications = client.get("/api/notifications", headers=auth_headers).get_json()
+    assert not [n for n in notifications if n["type"] == "step_completed"]
+
+
+def test_step_events_batch_converts_aware_timestamps_to_local_time(client, auth_headers):
+    exp = _create_experiment(client, auth_headers, "BatchUtcExp")
+    s1 = exp["steps"][0]["id"]
+    _force_step_ready(s1)
+
+    r = client.post(
+        "/api/steps/events",
+        headers=auth_headers,
+        json=[{"step_id": s1, "event": "start", "timestamp": "2026-10-15T12:00:00.000Z"}],
+    )
+    assert r.status_code == 200, r.get_json()
+    expected = datetime.fromisoformat("2026-10-15T12:00:00+00:00").astimezone()
+    assert r.get_json()[0]["steps"][0]["actual_start_time"] == (
+        expected.replace(tzinfo=None).isoformat()
+    )
+
+    # Later transitions mix this time with naive local ones.
+    assert client.post(f"/api/steps/{s1}/pause", headers=auth_headers).status_code == 200
+    r = client.post(f"/api/steps/{s1}/complete", headers=auth_headers)
+    assert r.status_code == 200
+    assert r.get_json()["steps"][0]["status"] == StepStatus.COMPLETED.value
+
+
+def test_unknown_step_type_falls_back_to_fixed_duration(client, auth_headers):
+    r = client.post(
+        "/api/experiments",
+        headers=auth_headers,
+        json={
+            "name": "Types",
+            "steps": [
+                {"name": "Known", "duration_seconds": 5, "step_type": "automated_task"},
+                {"name": "Unknown", "duration_seconds": 5, "step_type": "nope"},
+            ],
+        },
+    )
+    assert r.status_code == 201, r.get_json()
+    types = [s["step_type"] for s in r.get_json()["steps"]]
+    assert types == [StepType.AUTOMATED_TASK.value, StepType.FIXED_DURATION.value]
+
+
+def test_new_ids_are_unique_uuid4_strings():
+    import uuid
+
+    from models import _ID_BATCH, new_id
+
+    ids = [new_id() for _ in range(_ID_BATCH * 2 + 1)]
+    assert len(set(ids)) == len(ids)
+    for value in ids[:: _ID_BATCH // 4]:
+        parsed = uuid.UUID(value)
+        assert parsed.version == 4
+        assert str(parsed) == value
+
+
+def test_time_fields_keep_epoch_mirrors_in_sync():
+    step = Step(name="mirrored", duration=timedelta(seconds=90), step_type=StepType.TASK)
+    assert step._scheduled_start_ts is None and step._elapsed_s == 0.0
+
+    start = datetime(2026, 1, 1, 9, 0, 0)
+    step.status = StepStatus.READY
+    step.start(start)
+    assert step._actual_start_ts == start.timestamp()
+    step.complete(start + timedelta(seconds=30))
+    assert step._actual_end_ts == (start + timedelta(seconds=30)).timestamp()
+    assert step._elapsed_s == 30.0
+
+
+def test_empty_metadata_is_shared_and_read_only():
+    import pytest
+
+    from models import StepORM, _EMPTY_META
+
+    a = Step(name="a", duration=timedelta(seconds=5))
+    b = Step(name="b", duration=timedelta(seconds=5))
+    assert a.metadata is _EMPTY_META and b.metadata is _EMPTY_META
+    with pytest.raises(TypeError):
+        a.metadata["probe"] = "x"
+    assert len(_EMPTY_META) == 0
+
+    # Given metadata is kept; the ORM round trip stores and restores both.
+    c = Step(name="c", duration=timedelta(seconds=5), metadata={"probe": "x"})
+    assert c.metadata == {"probe": "x"}
+    assert StepORM.from_dataclass(a, "exp").step_metadata == {}
+    assert StepORM.from_dataclass(c, "exp").to_dataclass().metadata == {"probe": "x"}
+
+
+def test_transitions_log_instead_of_printing(capsys, caplog):
+    import logging
+
+    step = Step(name="quiet", duration=timedelta(seconds=5), step_type=StepType.TASK)
+    with caplog.at_level(logging.DEBUG, logger="models"):
+        step.start()  # PENDING: rejected
+        step.status = StepStatus.READY
+        step.start()
+
+    assert capsys.readouterr().out == ""
+    levels = [(r.levelno, r.getMessage()) for r in caplog.records if r.name == "models"]
+    assert levels[0] == (logging.WARNING, "Cannot start step 'quiet' with status pending")
+    assert levels[1][0] == logging.DEBUG and "started at" in levels[1][1]
+
+
+def test_dependency_ids_share_the_step_id_object():
+    parent = Step(name="parent", duration=timedelta(seconds=5))
+    # A copy, as a JSON parse would produce.
+    child = Step(name="child", duration=timedelta(seconds=5), dependencies=[str(parent.id.encode(), "ascii")])
+    assert child.dependencies == [parent.id]
+    assert child.dependencies[0] is parent.id
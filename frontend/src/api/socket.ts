@@ -50,6 +50,15 @@ class SocketService {
     this.socket.on('notification', (notification: any) => {
       this.notificationHandlers.forEach(handler => handler(notification));
     });
+
+    // Bursts (e.g. one completion unblocking several steps) arrive as a
+    // single `notifications` event carrying a list; fan them out one by one
+    // so subscribers see the same shape either way.
+    this.socket.on('notifications', (notifications: any[]) => {
+      notifications.forEach(notification => {
+        this.notificationHandlers.forEach(handler => handler(notification));
+      });
+    });
   }
 
   disconnectSocket() {